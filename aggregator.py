@@ -0,0 +1,216 @@
+"""One price per asset from every configured source at once.
+
+The sources run concurrently:
+
+  futures  Binance futures WebSocket (through the connection supervisor)
+  spot     Binance spot /ticker/price, polled by the adaptive scheduler
+  cmc      CoinMarketCap quotes, within the daily credit budget
+
+Each source's latest price is weighted by its age (the weight halves
+every HALF_LIFE seconds) and a source whose price is older than its
+stale limit drops out, so a stalled source is failed over from without
+any switching logic. The blend is redrawn as soon as any source
+delivers, so the display follows whichever source is fastest at the
+moment. While the futures stream is out, spot polling speeds up.
+
+Usage: python aggregator.py ASSET [ASSET ...] [--sources futures,spot,cmc] [--headless]
+(the CMC source needs CMC_PRO_API_KEY)
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Shared Binance helpers live next to the trackers in binancepy/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "binancepy"))
+from aio_runtime import stream_url
+import parsers
+from poller import PricePoller
+from scheduler import PollScheduler
+from supervisor import StreamHealth, Supervisor
+from cmc_client import CMCClient
+
+SOURCES = ("futures", "spot", "cmc")
+QUOTE = "USDT"  # Binance quote asset the assets are priced in
+HALF_LIFE = 5.0  # Seconds of age that halve a source's weight
+STREAM_MODE = "bookTicker"  # Futures stream; mid price on every book change
+POLL_INTERVAL = 10  # Average spot poll interval (seconds)
+MAX_FPS = 5
+
+def asset_of(symbol):
+    symbol = symbol.upper()
+    return symbol[:-len(QUOTE)] if symbol.endswith(QUOTE) else symbol
+
+class Aggregator:
+    """Latest price of every (asset, source) and their staleness-weighted blend"""
+
+    def __init__(self, assets, half_life=HALF_LIFE, on_update=None):
+        self.assets = list(assets)
+        self.half_life = half_life
+        self.on_update = on_update or (lambda asset, source: None)
+        self.latest = {asset: {} for asset in self.assets}  # source -> (price, event ms, received ms)
+        self.stale_after = {}  # source -> seconds before its prices drop out
+
+    def update(self, source, asset, price, event_ms=None):
+        if asset not in self.latest:
+            return
+        now_ms = int(time.time() * 1000)
+        self.latest[asset][source] = (price, event_ms or now_ms, now_ms)
+        self.on_update(asset, source)
+
+    def live(self, asset, now_ms=None):
+        """{source: (price, age seconds)} of the sources not yet stale"""
+        now_ms = now_ms or int(time.time() * 1000)
+        live = {}
+        for source, (price, event_ms, received_ms) in self.latest[asset].items():
+            # Event time says how old the price is; receive time guards against clock skew
+            age = (now_ms - min(event_ms, received_ms)) / 1000
+            if age <= self.stale_after.get(source, float("inf")):
+                live[source] = (price, age)
+        return live
+
+    def price(self, asset):
+        """(blended price, freshest source, {source: age}) or None if no source is live"""
+        live = self.live(asset)
+        if not live:
+            return None
+        weights = {source: 0.5 ** (age / self.half_life) for source, (_, age) in live.items()}
+        total = sum(weights.values())
+        blended = sum(weights[source] * price for source, (price, _) in live.items()) / total
+        freshest = min(live, key=lambda source: live[source][1])
+        return blended, freshest, {source: age for source, (_, age) in live.items()}
+
+async def futures_source(aggregator, assets, mode_name=STREAM_MODE):
+    mode = parsers.stream_mode(mode_name)
+    pairs = [f"{asset}{QUOTE}".lower() for asset in assets]
+    health = StreamHealth()
+    aggregator.stale_after["futures"] = mode.quiet_after
+
+    def on_message(message):
+        for tick in mode.parser(message) or ():
+            health.observe(tick.symbol.lower(), tick.event_time)
+            aggregator.update("futures", asset_of(tick.symbol), tick.price, tick.event_time)
+
+    supervisor = Supervisor(lambda: stream_url(pairs, mode), on_message, health, quiet_after=mode.quiet_after)
+    await supervisor.run(asyncio.Queue(), mode.stream)
+
+async def spot_source(aggregator, scheduler):
+    aggregator.stale_after["spot"] = scheduler.max_interval * 2
+    while True:
+        prices = await asyncio.to_thread(scheduler.poll)
+        for symbol, (price, event_ms) in prices.items():
+            aggregator.update("spot", asset_of(symbol), price, event_ms)
+        await asyncio.sleep(min(scheduler.wait(), 1))
+
+async def cmc_source(aggregator, client, assets):
+    while True:
+        quotes = await asyncio.to_thread(client.quotes, assets)
+        # CMC refreshes are minutes apart; a quote counts until two are missed
+        aggregator.stale_after["cmc"] = client.refresh_interval() * 2
+        for asset, quote in quotes.items():
+            aggregator.update("cmc", asset, quote.price, quote.updated)
+        await asyncio.sleep(max(client.next_refresh_in(), 1))
+
+async def watch(aggregator, changed, scheduler=None, interval=1.0):
+    """Report sources dropping out/returning and boost spot polling while futures is out"""
+    previous = {}
+    while True:
+        await asyncio.sleep(interval)
+        live = {asset: set(aggregator.live(asset)) for asset in aggregator.assets}
+        for asset, sources in live.items():
+            before = previous.get(asset)
+            if before is not None and sources != before:
+                for source in sorted(before - sources):
+                    print(f"Aggregator: {source} stalled for {asset}, using {', '.join(sorted(sources)) or 'nothing'}")
+                for source in sorted(sources - before):
+                    print(f"Aggregator: {source} back for {asset}")
+        previous = live
+        if scheduler is not None:
+            scheduler.set_shown([f"{asset}{QUOTE}" for asset, sources in live.items() if "futures" not in sources])
+        # Ages move the blend even without new prices
+        changed.set()
+
+def format_price(price):
+    return f"${price:,.4f}" if price >= 0.1 else f"${price:,.8f}"
+
+async def render(aggregator, changed, show, cycle=5.0, max_fps=MAX_FPS):
+    """Show one asset at a time (cycling every cycle seconds), redrawn on every update"""
+    min_frame_time = 1.0 / max_fps
+    shown = None
+    started = time.monotonic()
+    while True:
+        try:
+            await asyncio.wait_for(changed.wait(), cycle)
+        except asyncio.TimeoutError:
+            pass
+        changed.clear()
+
+        frame_start = time.monotonic()
+        asset = aggregator.assets[int((frame_start - started) // cycle) % len(aggregator.assets)]
+        blend = aggregator.price(asset)
+        if blend is None:
+            frame = (asset, "No live source", {})
+        else:
+            price, freshest, ages = blend
+            # e.g. "FARTCOIN futures 2/3": freshest source, live/known sources
+            frame = (f"{asset} {freshest} {len(ages)}/{len(aggregator.latest[asset])}", format_price(price), ages)
+        if frame[:2] != shown:
+            show(*frame)
+            shown = frame[:2]
+
+        elapsed = time.monotonic() - frame_start
+        if elapsed < min_frame_time:
+            await asyncio.sleep(min_frame_time - elapsed)
+
+async def run(assets, sources, show, cycle=5.0):
+    changed = asyncio.Event()
+    aggregator = Aggregator(assets, on_update=lambda asset, source: changed.set())
+    tasks = [render(aggregator, changed, show, cycle)]
+    scheduler = None
+    if "futures" in sources:
+        tasks.append(futures_source(aggregator, assets))
+    if "spot" in sources:
+        poller = PricePoller("spot")
+        symbols = [f"{asset}{QUOTE}" for asset in assets]
+        scheduler = PollScheduler(poller, symbols, 1, POLL_INTERVAL * 4,
+                                  weight_rate=poller.weight(len(symbols)) / POLL_INTERVAL)
+        tasks.append(spot_source(aggregator, scheduler))
+    if "cmc" in sources:
+        api_key = os.environ.get("CMC_PRO_API_KEY")
+        if api_key:
+            tasks.append(cmc_source(aggregator, CMCClient(api_key), assets))
+        else:
+            print("CMC_PRO_API_KEY not set, skipping the cmc source")
+    tasks.append(watch(aggregator, changed, scheduler))
+    await asyncio.gather(*tasks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Blend Binance spot, futures and CMC prices")
+    parser.add_argument("assets", nargs="+", help="base assets, e.g. FARTCOIN BTC")
+    parser.add_argument("--sources", default=",".join(SOURCES), help="comma-separated, from " + ", ".join(SOURCES))
+    parser.add_argument("--cycle", type=float, default=5, help="seconds per asset on the display")
+    parser.add_argument("--headless", action="store_true", help="print instead of using the OLED")
+    args = parser.parse_args()
+
+    sources = [source for source in args.sources.split(",") if source in SOURCES]
+    assets = [asset_of(asset) for asset in args.assets]
+
+    if args.headless:
+        def show(title, text, ages):
+            stamp = time.strftime("%H:%M:%S")
+            print(f"[{stamp}] {title}: {text}  " + " ".join(f"{s} {age:.1f}s" for s, age in sorted(ages.items())))
+    else:
+        from oled import LazyDisplay
+        display = LazyDisplay(port=1, address=0x3C).start()
+
+        def show(title, text, ages):
+            display.show([((3, 1), "small", title), ((3, 14), "small", text)])
+
+    try:
+        asyncio.run(run(assets, sources, show, args.cycle))
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+
+if __name__ == "__main__":
+    main()
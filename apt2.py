@@ -1,50 +1,37 @@
-from requests import Request, Session
-from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
-from luma.oled.device import ssd1306
-from luma.core.interface.serial import i2c
-from PIL import Image, ImageDraw, ImageFont
-import json
+import os
+import sys
 import threading
 import time
+from cmc_client import CMCClient
 
-# Initialize OLED for 128x32 resolution
-serial = i2c(port=1, address=0x3C)
-device = ssd1306(serial, width=128, height=32)
+# Shared display helpers live next to the trackers in binancepy/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "binancepy"))
+from oled import LazyDisplay
 
-font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 10)
+# Device and glyph atlas are built in the background (see binancepy/oled.py)
+oled = LazyDisplay(port=1, address=0x3C)
 
-url = 'https://pro-api.coinmarketcap.com/v4/dex/pairs/quotes/latest'
-
-parameters = {
-  'symbol': 'FARTCOIN',  # Replace with your desired cryptocurrency symbol
-  'convert': 'USD'  # The currency you want the price in
-}
-
-headers = {
-  'Accepts': 'application/json',
-  'X-CMC_PRO_API_KEY': 'cc9bcba4-b84c-4f21-8e66-6ec9124e5891',
+API_KEY = 'cc9bcba4-b84c-4f21-8e66-6ec9124e5891'
+NETWORK = 'solana'  # network_slug of the DEX pairs
+# Label -> DEX pair contract address (the v4 endpoint looks pairs up by address)
+PAIRS = {
+  'FARTCOIN': '',  # Fill in the pair address to track it
 }
+DAILY_CREDITS = 333  # CMC credits to spend per UTC day; refreshes are spaced to fit
 
-session = Session()
-session.headers.update(headers)
+# Batched and cached; the spend is tracked from each response's status block
+client = CMCClient(API_KEY, "dex", DAILY_CREDITS, network=NETWORK)
 
 running = True
 display_text = "Initializing.._"
 
-def update_ds()
-    # Create blank image (128x32)
-    image = Image.new("1", (128, 32), "black")
-    draw = ImageDraw.Draw(image)
-    
-    # Debug: Draw full boundary box
-    draw.rectangle((0, 0, 127, 31), outline="white", fill="black")
-    
-    # Adjust text position to be clearly visible
-    draw.text((1, 1), display_text, font=font, fill="white")
-    
-    # Display image
-    device.display(image)
-    print(f"Display updated with: {display_text}")
+def update_ds():
+    try:
+        # Paste cached glyphs onto the pre-drawn bordered background
+        oled.show([((1, 1), "small", display_text)])
+        print(f"Display updated with: {display_text}")
+    except Exception as e:
+        print(f"Display error: {e}")
     
 def input_loop():
     """Function that handles user input"""
@@ -59,31 +46,33 @@ def input_loop():
 def display_loop():
     global running
     while running:
-        update_display()
+        update_ds()
         time.sleep(30)
 
 def check_price():
     global running
     if not running:
         return  # Exit if we're no longer running
-    try:
-        response = session.get(url, params=parameters)
-        #raw_json = response.text
-        #print(raw_json)
-        data = json.loads(response.text)
-        fart_p = data['data']['FARTCOIN'][0]['quote']['USD']['price']
-        fart_pr = round(fart_p,5)
-        print(fart_pr)      
-    except (ConnectionError, Timeout, TooManyRedirects) as e:
-        print(e)
+    addresses = [address for address in PAIRS.values() if address]
+    if not addresses:
+        print("No DEX pair addresses configured in PAIRS")
+        return
+    quotes = client.quotes(addresses)
+    for label, address in PAIRS.items():
+        if address in quotes:
+            price = round(quotes[address].price, 5)
+            print(f"{label}: {price}")
     if running:
-        timer = threading.Timer(60.0, check_price)
+        # Next call when the cache is due, as planned from the credit budget
+        timer = threading.Timer(max(client.next_refresh_in(), 1.0), check_price)
         timer.daemon = True  # This ensures the timer won't prevent program exit
         timer.start()
 
             
 if __name__ == "__main__":    
-    # Start the price checking immediately and then every 30 seconds
+    oled.start(on_ready=update_ds)
+
+    # Start the price checking immediately, then as often as the budget allows
     check_price()
     
     # Start the input handling loop
@@ -0,0 +1,258 @@
+import asyncio
+import signal
+import time
+import endpoints
+import parsers
+import snapshot
+from supervisor import StreamHealth, Supervisor
+
+STREAM_BASE_URL = f"{endpoints.FUTURES_WS_URL}/stream"
+
+def stream_url(pairs, mode=parsers.stream_mode()):
+    """Combined-stream URL carrying the mode's stream for every pair"""
+    streams = "/".join(mode.stream(pair) for pair in pairs)
+    return f"{STREAM_BASE_URL}?streams={streams}"
+
+def pair_label(pair):
+    return pair.upper().replace('USDT', '/USDT')
+
+class PriceBoard:
+    """Latest price per pair and which one is shown.
+
+    Owned by the event loop: tasks update it and the render task waits on
+    its changed event, so no locks are needed. An optional StatsEngine
+    (stats.py) and ChartBook (sparkline.py) receive every tick as well;
+    health tracks each pair's exchange event time for the supervisor.
+    """
+
+    def __init__(self, pairs, status="Connecting", stats=None, charts=None):
+        self.pairs = [pair.lower() for pair in pairs]
+        self.prices = {}
+        self.index = 0
+        self.status = status
+        self.last_message = time.monotonic()
+        self.changed = asyncio.Event()
+        self.stats = stats
+        self.charts = charts
+        self.backlog = None  # Ticks kept for replay while history is loading
+        self.health = StreamHealth()
+
+    @property
+    def shown_pair(self):
+        return self.pairs[self.index] if self.pairs else None
+
+    def update(self, pair, text, event_time=None):
+        """Store a new price; a price for the shown pair replaces any status"""
+        self.prices[pair] = text
+        self.last_message = time.monotonic()
+        self.health.observe(pair, event_time)
+        if pair == self.shown_pair:
+            self.status = None
+            self.changed.set()
+
+    def feed(self, pair, time_ms, price, volume=0.0):
+        """Hand a tick to the stats and chart, if any"""
+        if self.backlog is not None:
+            self.backlog.append((pair, time_ms, price, volume))
+        if self.stats is not None:
+            self.stats.update(pair, time_ms, price, volume)
+        if self.charts is not None:
+            self.charts.update(pair, time_ms, price)
+
+    def set_status(self, text):
+        """Show a status message until the next price of the shown pair.
+
+        Once there is a price to show it stays up, marked stale, instead.
+        """
+        if self.shown_pair in self.prices:
+            self.prices = {pair: snapshot.stale(text) for pair, text in self.prices.items()}
+        else:
+            self.status = text
+        self.changed.set()
+
+    def select(self, index):
+        """Show another pair; its last price is already in memory"""
+        if index < len(self.pairs) and index != self.index:
+            self.index = index
+            self.status = None
+            self.changed.set()
+            print(f"Switching to {self.shown_pair}")
+
+    def frame(self):
+        """(text, symbol label) to draw for the current state"""
+        pair = self.shown_pair
+        text = self.status or self.prices.get(pair, "Waiting...")
+        return text, pair_label(pair) if pair else ""
+
+    def chart_version(self):
+        """Plot version of the shown pair's chart (None without one)"""
+        chart = self.charts.get(self.shown_pair) if self.charts is not None else None
+        return chart.version if chart is not None else None
+
+def handle_message(board, message, recorder=None, mode=parsers.stream_mode()):
+    """Parse one stream frame (str or bytes) into the board (and recorder)"""
+    try:
+        ticks = mode.parser(message)
+
+        # Replies to SUBSCRIBE/UNSUBSCRIBE carry an id instead of stream data
+        if ticks is None:
+            print(f"Subscription reply: {message}")
+            return
+
+        for tick in ticks:
+            board.update(tick.symbol.lower(), mode.format(tick), tick.event_time)
+            board.feed(tick.symbol.lower(), tick.event_time, tick.price, tick.volume)
+            if recorder:
+                recorder.record(tick.symbol, tick.event_time, tick.price, tick.volume)
+    except Exception as e:
+        print(f"Error processing message: {e}")
+
+def set_pairs(board, commands, pairs):
+    """Replace the pair list, queueing live SUBSCRIBE/UNSUBSCRIBE requests"""
+    pairs = [pair.lower() for pair in pairs]
+    added = [pair for pair in pairs if pair not in board.pairs]
+    removed = [pair for pair in board.pairs if pair not in pairs]
+
+    if added:
+        commands.put_nowait(("SUBSCRIBE", added))
+    if removed:
+        commands.put_nowait(("UNSUBSCRIBE", removed))
+
+    shown = board.shown_pair
+    board.pairs = pairs
+    for pair in removed:
+        board.prices.pop(pair, None)
+        board.health.forget(pair)
+    board.index = pairs.index(shown) if shown in pairs else 0
+    board.changed.set()
+
+async def render(board, show, max_fps=10):
+    """Render task: call show(text, symbol) when the visible text or chart changes"""
+    min_frame_time = 1.0 / max_fps
+    shown = None
+
+    while True:
+        await board.changed.wait()
+        board.changed.clear()
+
+        frame_start = time.monotonic()
+        frame = board.frame()
+        # A flat price still scrolls the chart, so its plot counts as well
+        key = (frame, board.chart_version())
+        if key != shown:
+            show(*frame)
+            shown = key
+
+        # Coalesce bursts of ticks into at most max_fps frames
+        elapsed = time.monotonic() - frame_start
+        if elapsed < min_frame_time:
+            await asyncio.sleep(min_frame_time - elapsed)
+
+async def poll_buttons(board, read_buttons, interval=0.1, debounce=0.3):
+    """Button task: read_buttons() returns a pair index or None"""
+    last_press = 0.0
+    while True:
+        index = read_buttons()
+        now = time.monotonic()
+        if index is not None and now - last_press >= debounce:
+            board.select(index)
+            last_press = now
+        await asyncio.sleep(interval)
+
+async def load_history(board):
+    """Backfill task: seed the stats/chart from the history stored by the
+    last run at once, then download what is missing without holding up
+    the first frame or the stream, and rebuild with it.
+
+    Live ticks that arrive during the download are kept and replayed on
+    top of the history, so every series stays in time order.
+    """
+    import backfill
+    start = time.monotonic()
+    backfill.seed(board)
+    board.changed.set()
+    board.backlog = []
+    try:
+        results = await asyncio.to_thread(backfill.backfill, board.pairs, timeout=backfill.TIMEOUT)
+    except Exception as e:
+        print(f"Backfill error: {e}")
+        board.backlog = None
+        return
+
+    # No await from here on: nothing can interleave with the rebuild
+    backlog, board.backlog = board.backlog, None
+    added = sum(count for count in results.values() if count)
+    if not added:
+        print(f"Backfill: history up to date, seeded {len(board.pairs)} pairs in {time.monotonic() - start:.2f}s")
+        return
+    for series in (board.stats, board.charts):
+        if series is not None:
+            series.clear()
+    backfill.seed(board)
+    for tick in backlog:
+        board.feed(*tick)
+    board.changed.set()
+    print(f"Backfill: {added} new klines, seeded {len(board.pairs)} pairs "
+          f"(+{len(backlog)} live ticks) in {time.monotonic() - start:.2f}s")
+
+async def checkpoint(board, path, interval=snapshot.SNAPSHOT_INTERVAL):
+    """Snapshot task: save the board for the next start's first frame"""
+    while True:
+        await asyncio.sleep(interval)
+        snapshot.save_board(board, path)
+
+async def run(board, show, read_buttons=None, max_fps=10, commands=None, recorder=None,
+              mode=parsers.stream_mode(), snapshot_path=None, standby=False, history=False):
+    """Run the tracker tasks until Ctrl+C, or return on SIGTERM (systemd stop).
+
+    The board and the commands queue are the channels between tasks;
+    pass in the same queue to set_pairs() to change pairs while running.
+    Every tick is also handed to recorder (a TickRecorder) if given;
+    mode picks the stream type, its parser and the display format
+    (see parsers.stream_mode). With a snapshot_path the board is saved
+    periodically and on shutdown (see snapshot.py). standby keeps a
+    second connection open for instant failover (see supervisor.py).
+    With history, kline history is loaded into the stats/chart in the
+    background once streaming has started (see backfill.py).
+    """
+    if commands is None:
+        commands = asyncio.Queue()
+    supervisor = Supervisor(
+        lambda: stream_url(board.pairs, mode),
+        lambda message: handle_message(board, message, recorder, mode),
+        board.health, standby, mode.quiet_after, board.set_status,
+    )
+
+    # SIGTERM ends the run normally, so callers need no CancelledError handling
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+
+    board.changed.set()
+    tasks = [
+        asyncio.create_task(supervisor.run(commands, mode.stream)),
+        asyncio.create_task(render(board, show, max_fps)),
+    ]
+    if read_buttons:
+        tasks.append(asyncio.create_task(poll_buttons(board, read_buttons)))
+    if snapshot_path:
+        tasks.append(asyncio.create_task(checkpoint(board, snapshot_path)))
+    if history and (board.stats is not None or board.charts is not None):
+        tasks.append(asyncio.create_task(load_history(board)))
+
+    running = asyncio.gather(*tasks)
+    stopping = asyncio.create_task(stop.wait())
+    try:
+        await asyncio.wait([running, stopping], return_when=asyncio.FIRST_COMPLETED)
+        if running.done():
+            running.result()  # A task failed: raise its error
+    finally:
+        # Deterministic shutdown: every task is cancelled and awaited
+        loop.remove_signal_handler(signal.SIGTERM)
+        print("\nShutting down...")
+        stopping.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(running, stopping, return_exceptions=True)
+        if snapshot_path:
+            snapshot.save_board(board, snapshot_path)
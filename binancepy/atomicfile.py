@@ -0,0 +1,16 @@
+import json
+import os
+import tempfile
+
+def atomic_write_json(path, obj):
+    """Write obj as compact JSON atomically, so a crash or power cut never leaves a partial file"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(obj, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,183 @@
+"""Kline history for the configured pairs, kept on disk between runs.
+
+Each (pair, interval) is stored as one raw file per column (time, open,
+high, low, close, volume) and read back through np.memmap, so loading a
+day of history costs a few page faults. Later runs only download the
+klines after the last stored one; pairs are fetched in parallel and
+requests back off when the used request weight nears the limit.
+
+Usage: python backfill.py PAIR [PAIR ...] [--interval 1m] [--hours 24]
+"""
+import argparse
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+import numpy as np
+import requests
+import endpoints
+from ratelimit import WEIGHT_LIMITS, WeightBudget, klines_weight
+
+KLINES_URL = f"{endpoints.FUTURES_REST_URL}/fapi/v1/klines"
+STORE_DIR = os.path.expanduser("~/.cache/price_tracker/klines")
+INTERVAL = "1m"
+HISTORY_HOURS = 24  # How far back a pair with no stored history starts
+PAGE_LIMIT = 1500  # Futures maximum klines per request (weight 10)
+TIMEOUT = 5  # Seconds a startup backfill may take before the board is seeded anyway
+
+COLUMNS = (
+    ("time", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.float64),
+)
+
+INTERVAL_MS = {"1m": 60000, "3m": 180000, "5m": 300000, "15m": 900000, "30m": 1800000,
+               "1h": 3600000, "4h": 14400000, "1d": 86400000}
+
+class KlineStore:
+    """Column files of one (pair, interval), memory-mapped for reading.
+
+    Rows are only ever appended. The time column is written last, so
+    its length is the number of complete rows even after a crash.
+    """
+
+    def __init__(self, pair, interval=INTERVAL, directory=STORE_DIR):
+        self.path = os.path.join(directory, f"{pair.lower()}-{interval}")
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def __len__(self):
+        try:
+            return os.path.getsize(self._file("time")) // 8
+        except OSError:
+            return 0
+
+    def columns(self):
+        """{name: read-only memmap} of every complete row"""
+        count = len(self)
+        if not count:
+            return {name: np.empty(0, dtype) for name, dtype in COLUMNS}
+        return {name: np.memmap(self._file(name), dtype, "r", shape=(count,)) for name, dtype in COLUMNS}
+
+    def last_time(self):
+        """Open time of the newest stored kline, or None"""
+        count = len(self)
+        if not count:
+            return None
+        return int(np.memmap(self._file("time"), np.int64, "r", offset=(count - 1) * 8, shape=(1,))[0])
+
+    def append(self, rows):
+        """Append raw /klines rows (closed klines only)"""
+        if not rows:
+            return
+        count = len(self)
+        table = np.array([row[:6] for row in rows], dtype=np.float64)
+        for index, (name, dtype) in reversed(list(enumerate(COLUMNS))):
+            with open(self._file(name), "r+b" if os.path.exists(self._file(name)) else "wb") as f:
+                # Drop any partial tail left by an interrupted append
+                f.truncate(count * 8)
+                f.seek(count * 8)
+                f.write(table[:, index].astype(dtype).tobytes())
+
+def new_budget():
+    return WeightBudget(WEIGHT_LIMITS["futures"], name="Backfill")
+
+def fetch_klines(pair, start_ms, interval, budget, limit=PAGE_LIMIT):
+    """One page of klines from start_ms"""
+    budget.acquire(klines_weight(limit))
+    response = requests.get(KLINES_URL, params={
+        "symbol": pair.upper(), "interval": interval, "startTime": start_ms, "limit": limit,
+    }, timeout=10)
+    budget.report(response)
+    response.raise_for_status()
+    return response.json()
+
+def backfill_pair(pair, interval=INTERVAL, hours=HISTORY_HOURS, budget=None, directory=STORE_DIR):
+    """Download and append the closed klines missing from a pair's store"""
+    budget = budget or new_budget()
+    store = KlineStore(pair, interval, directory)
+    step = INTERVAL_MS[interval]
+    last = store.last_time()
+    start = last + step if last is not None else int(time.time() * 1000) - int(hours * 3600000)
+    added = 0
+    while True:
+        now = int(time.time() * 1000)
+        rows = fetch_klines(pair, start, interval, budget)
+        closed = [row for row in rows if row[6] < now]
+        store.append(closed)
+        added += len(closed)
+        if len(rows) < PAGE_LIMIT or not closed:
+            return added
+        start = closed[-1][0] + step
+
+def backfill(pairs, interval=INTERVAL, hours=HISTORY_HOURS, timeout=None, directory=STORE_DIR):
+    """Backfill every pair in parallel; returns {pair: klines added or None}.
+
+    With a timeout, pairs still downloading are reported as None and
+    keep going in the background; their rows are on disk next run. The
+    workers are daemon threads, so they never hold up the tracker's exit
+    (an append cut short is dropped on the next one, see KlineStore).
+    """
+    budget = new_budget()
+    futures = {pair: Future() for pair in pairs}
+    todo = queue.SimpleQueue()
+    for pair in pairs:
+        todo.put(pair)
+
+    def worker():
+        while True:
+            try:
+                pair = todo.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                futures[pair].set_result(backfill_pair(pair, interval, hours, budget, directory))
+            except Exception as e:
+                futures[pair].set_exception(e)
+
+    for _ in range(min(len(pairs), 8)):
+        threading.Thread(target=worker, daemon=True).start()
+    wait(futures.values(), timeout)
+
+    results = {}
+    for pair, future in futures.items():
+        if not future.done():
+            results[pair] = None
+        elif future.exception():
+            print(f"Backfill error for {pair}: {future.exception()}")
+            results[pair] = None
+        else:
+            results[pair] = future.result()
+    return results
+
+def seed(board, interval=INTERVAL, directory=STORE_DIR):
+    """Load stored history into the board's stats and charts"""
+    for pair in board.pairs:
+        columns = KlineStore(pair, interval, directory).columns()
+        if not len(columns["time"]):
+            continue
+        if board.stats is not None:
+            board.stats.seed(pair, columns["time"], columns["close"], columns["volume"])
+        if board.charts is not None:
+            board.charts.seed(pair, columns["close"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Download kline history into the local store")
+    parser.add_argument("pairs", nargs="+")
+    parser.add_argument("--interval", default=INTERVAL, choices=sorted(INTERVAL_MS))
+    parser.add_argument("--hours", type=float, default=HISTORY_HOURS, help="history for pairs with none stored")
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    for pair, added in backfill(args.pairs, args.interval, args.hours).items():
+        print(f"{pair}: +{added} klines, {len(KlineStore(pair, args.interval))} stored")
+    print(f"Done in {time.monotonic() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,98 +1,112 @@
-import requests
-from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
-from luma.oled.device import ssd1306
-from luma.core.interface.serial import i2c
-from PIL import Image, ImageDraw, ImageFont
+from display_state import DisplayState, render_loop
+from oled import LazyDisplay
+from poller import PricePoller
+from scheduler import PollScheduler
+import snapshot
 import json
 import threading
 import time
 from datetime import datetime
 
 # Configuration
-serial = i2c(port=1, address=0x3C)
-device = ssd1306(serial, width=128, height=32)
-font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 10)
+# Device and glyph atlas are built in the background (see oled.py)
+oled = LazyDisplay(port=1, address=0x3C)
 symbol = 'FARTCOINUSDT'  # Change to your desired currency pair
-interval_seconds = 5
-binance_url = f"https://fapi.binance.com/fapi/v1/ticker/price?symbol={symbol}"
+interval_seconds = 5  # Average poll interval; the scheduler never spends more weight than this did
+MIN_INTERVAL = 1  # Fastest polling, when the price moves quickly
+MAX_INTERVAL = 30  # Slowest polling, when the market is flat
+ALERT_LEVELS = []  # Prices to print an alert at; polled more often while the price is near one
+poller = PricePoller("futures")  # Keep-alive session, request weight respected
 running = True
+MAX_FPS = 10  # Upper bound on redraws per second; bursts are coalesced
+SNAPSHOT_PATH = snapshot.snapshot_path("bap")  # Last price, shown (stale) at the next boot
+STATS = False  # Keep rolling OHLC/EMA/range of the polled price (see stats.py); nothing on screen reads them yet
 
 lock = threading.Lock()
-display_text = "Initializing..."
-last_update_time = time.time()
+display = DisplayState("Initializing...")
+stats = None
+if STATS:
+    from stats import StatsEngine
+    stats = StatsEngine()  # No volume over REST
+last_price = None  # Last formatted price, for the snapshot
 
-def update_ds():
-    global display_text
+def alert(alert_symbol, level, price):
+    print(f"Alert: {alert_symbol} crossed {level} (now {price})")
+
+# Poll timing follows volatility and the request weight left
+scheduler = PollScheduler(poller, [symbol], MIN_INTERVAL, MAX_INTERVAL,
+                          weight_rate=poller.weight(1) / interval_seconds, on_alert=alert)
+scheduler.set_shown([symbol])
+scheduler.set_alerts(symbol, ALERT_LEVELS)
+
+def update_ds(current_text, current_symbol):
     try:
-        # Thread-safe access to display_text
-        with lock:
-            current_text = display_text
-            current_time = time.strftime("%H:%M:%S")
-        # Create blank image (128x32)
-        image = Image.new("1", (128, 32), "black")
-        draw = ImageDraw.Draw(image)
-        # Debug: Draw full boundary box
-        draw.rectangle((0, 0, 127, 31), outline="white", fill="black")
-        # Adjust text position to be clearly visible
-        font = ImageFont.load_default(size=24) # Increase size from whatever default was
-        draw.text((1, 1), str(display_text), font=font, fill="white")
-        # Display image
-        device.display(image)
-        print(f"Display updated with: {display_text}")
+        current_time = time.strftime("%H:%M:%S")
+        # Paste cached glyphs onto the pre-drawn bordered background
+        oled.show([((1, 1), "large", current_text)])
+        print(f"Display updated with: {current_text}")
     except Exception as e:
         print(f"Display error: {e}")  
 
 def display_loop():
-    global running
-    while running:
-        update_ds()
-        time.sleep(2)
+    # Redraw only when fetch_price changes the text
+    render_loop(display, update_ds, lambda: running, MAX_FPS)
    
 
 def fetch_price():
-    global display_text, last_update_time
+    global last_price
     try:
-        response = requests.get(binance_url)
-        data = response.json()
+        # Only polls when the scheduler says the symbol is due
+        prices = scheduler.poll()
+        if symbol not in prices:
+            return
         
         # Format the price with commas for 1/1.000
-        price_float = float(data['price'])
+        price_float, event_time = prices[symbol]
         price_fm = f"${price_float:,.4f}"
-        display_text = str(price_fm)
+        if stats:
+            stats.update(symbol, event_time, price_float)
+        with lock:
+            last_price = price_fm
+        display.set(price_fm)
         print(price_fm)
         
     except Exception as e:
         print(f"Error fetching price: {e}")
 
-def connection_watchdog():
-    """Monitor connection and restart if needed"""
-    global running, last_update_time
-    
-    while running:
-        current_time = time.time()
-        with lock:
-            time_since_update = current_time - last_update_time
-            
-        # If no price updates for over 2 minutes, force a refresh
-        if time_since_update > 120:
-            print("Watchdog: No updates for 2 minutes, forcing refresh...")
-            fetch_price()
-            
-        time.sleep(30)  # Check every 30 seconds
-
+def save_snapshot():
+    with lock:
+        price = last_price
+    if price:
+        try:
+            snapshot.save(SNAPSHOT_PATH, snapshot.state([symbol.lower()], 0, {symbol.lower(): price}))
+        except OSError as e:
+            print(f"Snapshot error: {e}")
 
 def main():
     global running
+    # Last known price instead of "Initializing..." until the first fetch
+    saved = snapshot.load(SNAPSHOT_PATH)
+    if saved and saved["prices"].get(symbol.lower()):
+        display.set(snapshot.stale(saved["prices"][symbol.lower()]))
+
+    oled.start()
     display_thread = threading.Thread(target=display_loop)
     display_thread.daemon = True
     display_thread.start()
+    last_snapshot = time.time()
     try:
         while running:
             fetch_price()
-            time.sleep(interval_seconds)
+            if time.time() - last_snapshot >= snapshot.SNAPSHOT_INTERVAL:
+                save_snapshot()
+                last_snapshot = time.time()
+            time.sleep(min(scheduler.wait(), 1))
     except KeyboardInterrupt:
         print("\nShutting down...")
         running = False
+        save_snapshot()
+        display.wake()
         time.sleep(1)
 
 if __name__ == "__main__":
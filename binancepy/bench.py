@@ -0,0 +1,143 @@
+"""Micro-benchmarks for the per-tick hot path: ingest -> parse -> format -> render -> push.
+
+Each case is timed in small batches and reported as per-op latency
+percentiles and ops/sec. Results can be saved as a baseline and later
+runs compared against it, e.g. on the Pi Zero itself:
+
+    python bench.py --save          # record bench_baseline.json
+    python bench.py                 # compare against it
+    python bench.py --only render   # cases whose name contains 'render'
+"""
+import argparse
+import json
+import os
+import random
+import time
+from luma.oled.device import ssd1306
+import aio_runtime
+import market
+import parsers
+import screener
+from bench_render import legacy_frame
+from fakeserial import CountingSerial
+from framediff import DiffingDevice
+from mockserver import MarketSim, compact
+from render import Renderer
+from sparkline import Sparkline
+from replay import percentile
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+def sample_messages(count=1000):
+    """Realistic combined-stream @ticker messages from the mock market"""
+    sim = MarketSim(["FARTCOINUSDT"])
+    return [compact({"stream": "fartcoinusdt@ticker", "data": sim.ticker("FARTCOINUSDT")})
+            for _ in range(count)]
+
+def sample_array_messages(symbols=400, count=20):
+    """!miniTicker@arr frames covering a market of this many symbols"""
+    sim = MarketSim([f"SIM{i:04d}USDT" for i in range(symbols)])
+    return [compact(sim.payload("!miniTicker@arr")) for _ in range(count)]
+
+def build_cases():
+    """[(name, function, inputs, batch size)] for every hot-path stage"""
+    messages = sample_messages()
+    frames_bytes = [message.encode() for message in messages]
+    decoded = [json.loads(message) for message in messages]
+    prices = [float(data['data']['c']) for data in decoded]
+    texts = [f"${price:,.4f}" for price in prices]
+
+    array_messages = sample_array_messages()
+    table = market.MarketTable()
+    movers = screener.Screener()
+    for message in array_messages:
+        movers.apply(table, market.handle_frame(table, message))
+    ticks = [(symbol, random.gauss(0, 5), random.uniform(0, 1e8)) for symbol in table.symbols] * 3
+
+    board = aio_runtime.PriceBoard(["fartcoinusdt"])
+    renderer = Renderer()
+    frames = [renderer.render([((3, 1), "large", text)]).copy() for text in texts[:200]]
+    spark = Sparkline()
+    spark.extend(prices)
+
+    def chart_tick(price):
+        spark.append(price)
+        return renderer.render([((3, 1), "small", "$0.0000")], [((1, 13), spark.image())])
+
+    full_device = ssd1306(CountingSerial(), width=128, height=32)
+    diff_device = DiffingDevice(ssd1306(CountingSerial(), width=128, height=32))
+
+    return [
+        ("json.loads", json.loads, messages, 20),
+        ("extract price", lambda data: float(data['data']['c']), decoded, 100),
+        ("format price", lambda price: f"${price:,.4f}", prices, 100),
+        ("parse json", parsers.parse_ticker_json, messages, 20),
+        ("parse fast", parsers.parse_ticker_fast, messages, 20),
+        ("parse fast bytes", parsers.parse_ticker_fast, frames_bytes, 20),
+        ("handle_message", lambda message: aio_runtime.handle_message(board, message), messages, 20),
+        ("market array 400", lambda message: market.handle_frame(table, message), array_messages, 1),
+        ("screener tick", lambda tick: movers.update(*tick), ticks, 100),
+        ("render legacy", legacy_frame, texts, 1),
+        ("render cached", lambda text: renderer.render([((3, 1), "large", text)]), texts, 5),
+        ("chart tick", chart_tick, prices, 5),
+        ("push full frame", full_device.display, frames, 1),
+        ("push diffed", diff_device.display, frames, 1),
+    ]
+
+def run_case(function, inputs, batch, duration):
+    """Per-op seconds, one sample per batch, for about duration seconds"""
+    samples = []
+    index = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline or len(samples) < 10:
+        args = [inputs[(index + i) % len(inputs)] for i in range(batch)]
+        index += batch
+        start = time.perf_counter()
+        for arg in args:
+            function(arg)
+        samples.append((time.perf_counter() - start) / batch)
+    return samples
+
+def summarize(samples):
+    return {
+        "p50_us": percentile(samples, 0.5) * 1e6,
+        "p90_us": percentile(samples, 0.9) * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+        "ops_per_sec": len(samples) / sum(samples),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per case")
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="store results as the baseline")
+    args = parser.parse_args()
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+
+    results = {}
+    print(f"{'case':>16} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9} {'ops/sec':>12}  vs baseline")
+    for name, function, inputs, batch in build_cases():
+        if args.only and args.only not in name:
+            continue
+        result = results[name] = summarize(run_case(function, inputs, batch, args.duration))
+        line = (f"{name:>16} {result['p50_us']:9.2f} {result['p90_us']:9.2f} "
+                f"{result['p99_us']:9.2f} {result['ops_per_sec']:12,.0f}")
+        if name in baseline:
+            change = result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1
+            line += f"  {change:+.1%}"
+        print(line)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+if __name__ == "__main__":
+    main()
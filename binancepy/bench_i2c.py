@@ -0,0 +1,38 @@
+"""Compare I2C bytes per update with and without frame diffing.
+
+Uses a counting fake serial, so no display is needed.
+Usage: python bench_i2c.py [updates]
+"""
+import random
+import sys
+from luma.oled.device import ssd1306
+from fakeserial import CountingSerial
+from framediff import DiffingDevice
+from render import Renderer
+
+def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    renderer = Renderer()
+
+    full_serial = CountingSerial()
+    full_device = ssd1306(full_serial, width=128, height=32)
+    diff_serial = CountingSerial()
+    diff_device = DiffingDevice(ssd1306(diff_serial, width=128, height=32))
+    full_serial.reset()
+    diff_serial.reset()
+
+    # Random walk of small ticks, like a live price
+    price = 1.0
+    for _ in range(updates):
+        price *= 1 + random.gauss(0, 0.0005)
+        image = renderer.render([((3, 1), "large", f"${price:,.4f}")])
+        full_device.display(image)
+        diff_device.display(image)
+
+    for name, serial in (("full frame", full_serial), ("diffed", diff_serial)):
+        print(f"{name:>10}: {serial.bytes_sent / updates:7.1f} bytes/update, "
+              f"{serial.transactions / updates:5.1f} transactions/update")
+    print(f"reduction: {full_serial.bytes_sent / diff_serial.bytes_sent:.1f}x")
+
+if __name__ == "__main__":
+    main()
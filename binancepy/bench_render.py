@@ -0,0 +1,40 @@
+"""Compare frames/sec of the old per-frame drawing against Renderer.
+
+Runs without a display: only the image building is timed.
+Usage: python bench_render.py [frames]
+"""
+import random
+import sys
+import time
+from PIL import Image, ImageDraw, ImageFont
+from render import Renderer
+
+def legacy_frame(text):
+    """Frame built the way update_display() used to build it"""
+    image = Image.new("1", (128, 32), "black")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, 127, 31), outline="white", fill="black")
+    font = ImageFont.load_default(size=24)
+    draw.text((3, 1), str(text), font=font, fill="white")
+    return image
+
+def measure(name, draw_frame, prices):
+    start = time.perf_counter()
+    for price in prices:
+        draw_frame(price)
+    elapsed = time.perf_counter() - start
+    fps = len(prices) / elapsed
+    print(f"{name:>10}: {fps:10.1f} frames/sec ({elapsed * 1000 / len(prices):.3f} ms/frame)")
+    return fps
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    prices = [f"${random.uniform(0.1, 2.0):,.4f}" for _ in range(frames)]
+
+    renderer = Renderer()
+    before = measure("legacy", legacy_frame, prices)
+    after = measure("renderer", lambda text: renderer.render([((3, 1), "large", text)]), prices)
+    print(f"speedup: {after / before:.1f}x")
+
+if __name__ == "__main__":
+    main()
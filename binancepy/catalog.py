@@ -0,0 +1,173 @@
+import re
+
+# Quote assets people usually mean, most likely first
+QUOTE_PRIORITY = ["USDT", "USDC", "FDUSD", "BUSD", "BTC", "ETH", "BNB", "TRY", "EUR"]
+MARKET_PRIORITY = {"spot": 0, "futures": 1}
+# Ranked ids kept on each trie node for type-ahead
+NODE_CAPACITY = 20
+# Candidates taken from the n-gram index before edit distances are computed
+FUZZY_CANDIDATES = 20
+# Bigrams found in more than 1/N of all symbols are skipped by fuzzy search
+COMMON_GRAM_DIVISOR = 20
+
+def normalize(text):
+    """Uppercase and drop separators, so 'btc/usdt' becomes 'BTCUSDT'"""
+    return re.sub(r"[^0-9A-Z]", "", text.upper())
+
+def bigrams(text):
+    padded = f"^{text}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, giving up with limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+class SymbolCatalog:
+    """Indexed spot and futures symbols built once from exchangeInfo.
+
+    markets maps a market name to its exchangeInfo symbol entries (dicts
+    with symbol, baseAsset, quoteAsset and optionally status). Lookups
+    go through a hash of exact symbols, a prefix trie whose nodes keep
+    their best-ranked symbols for type-ahead, base/quote asset indexes
+    and a bigram index for fuzzy matching.
+    """
+
+    def __init__(self, markets):
+        entries = []
+        for market, symbols in markets.items():
+            for info in symbols:
+                entries.append((
+                    market,
+                    info["symbol"],
+                    info.get("baseAsset", ""),
+                    info.get("quoteAsset", ""),
+                    info.get("status", "TRADING"),
+                ))
+
+        # Ids are assigned in rank order, so sorting ids sorts by rank
+        entries.sort(key=self._static_rank)
+        self.entries = entries
+
+        self._exact = {}
+        self._by_base = {}
+        self._by_quote = {}
+        self._grams = {}
+        self._trie = {}
+        for entry_id, (market, symbol, base, quote, status) in enumerate(entries):
+            self._exact.setdefault(symbol, []).append(entry_id)
+            self._by_base.setdefault(base, []).append(entry_id)
+            self._by_quote.setdefault(quote, []).append(entry_id)
+            for gram in bigrams(symbol):
+                self._grams.setdefault(gram, []).append(entry_id)
+            node = self._trie
+            for char in symbol:
+                node = node.setdefault(char, {})
+                ranked = node.setdefault("", [])
+                if len(ranked) < NODE_CAPACITY:
+                    ranked.append(entry_id)
+
+    @staticmethod
+    def _static_rank(entry):
+        market, symbol, base, quote, status = entry
+        quote_rank = QUOTE_PRIORITY.index(quote) if quote in QUOTE_PRIORITY else len(QUOTE_PRIORITY)
+        return (status != "TRADING", quote_rank, len(symbol), MARKET_PRIORITY.get(market, 2), symbol)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _results(self, ids, limit):
+        return [(self.entries[i][0], self.entries[i][1]) for i in ids[:limit]]
+
+    def lookup(self, symbol):
+        """Exact matches as [(market, symbol)], spot before futures"""
+        return self._results(self._exact.get(normalize(symbol), []), None)
+
+    def by_base(self, asset):
+        """Symbols whose base asset is asset, best quote first"""
+        return self._results(self._by_base.get(normalize(asset), []), None)
+
+    def by_quote(self, asset):
+        """Symbols quoted in asset"""
+        return self._results(self._by_quote.get(normalize(asset), []), None)
+
+    def complete(self, prefix, limit=5):
+        """Type-ahead: best-ranked symbols starting with prefix"""
+        node = self._trie
+        for char in normalize(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        return self._results(node.get("", []), limit)
+
+    def search(self, query, limit=5):
+        """Ranked matches for free-form input, best first.
+
+        Exact symbols come first, then pairs whose base asset is the
+        query (so 'BTC' finds BTCUSDT), then prefix completions, then
+        fuzzy matches ordered by edit distance.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        ranked = []
+        seen = set()
+
+        def add(ids):
+            for entry_id in ids:
+                if entry_id not in seen:
+                    seen.add(entry_id)
+                    ranked.append(entry_id)
+
+        add(self._exact.get(query, []))
+        add(self._by_base.get(query, []))
+        node = self._trie
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            add(node.get("", []))
+
+        if len(ranked) < limit:
+            add(self._fuzzy(query, seen))
+
+        return self._results(ranked, limit)
+
+    def _fuzzy(self, query, exclude):
+        """Ids sharing bigrams with query, ordered by edit distance"""
+        # Grams shared by a large part of the catalogue (quote assets like
+        # "US", "DT") say little about the match and dominate the cost
+        common = len(self.entries) // COMMON_GRAM_DIVISOR
+        postings = [self._grams.get(gram, ()) for gram in bigrams(query)]
+        rare = [ids for ids in postings if len(ids) <= common] or postings
+
+        shared = {}
+        for ids in rare:
+            for entry_id in ids:
+                if entry_id not in exclude:
+                    shared[entry_id] = shared.get(entry_id, 0) + 1
+        candidates = sorted(shared, key=lambda i: (-shared[i], i))[:FUZZY_CANDIDATES]
+
+        limit = max(2, len(query) // 2)
+        scored = []
+        for entry_id in candidates:
+            market, symbol, base, quote, status = self.entries[entry_id]
+            distance = min(edit_distance(query, symbol, limit), edit_distance(query, base, limit))
+            if distance <= limit:
+                scored.append((distance, entry_id))
+        scored.sort()
+        return [entry_id for _, entry_id in scored]
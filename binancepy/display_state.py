@@ -0,0 +1,62 @@
+import threading
+import time
+
+class DisplayState:
+    """Shared display text that wakes the renderer only when it changes"""
+
+    def __init__(self, text="", symbol=""):
+        self._cond = threading.Condition()
+        self.text = text
+        self.symbol = symbol
+        self.version = 0
+
+    def set(self, text=None, symbol=None):
+        """Update text and/or symbol, notifying the renderer if either changed"""
+        with self._cond:
+            new_text = self.text if text is None else str(text)
+            new_symbol = self.symbol if symbol is None else symbol
+            if (new_text, new_symbol) == (self.text, self.symbol):
+                return False
+            self.text = new_text
+            self.symbol = new_symbol
+            self.version += 1
+            self._cond.notify_all()
+            return True
+
+    def snapshot(self):
+        """Return (version, text, symbol) as one consistent read"""
+        with self._cond:
+            return self.version, self.text, self.symbol
+
+    def wait(self, version, timeout=None):
+        """Block until the state moves past version; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.version != version, timeout)
+
+    def wake(self):
+        """Wake any waiting renderer, e.g. on shutdown"""
+        with self._cond:
+            self._cond.notify_all()
+
+def render_loop(state, render, is_running, max_fps=10):
+    """Call render(text, symbol) whenever the state changes.
+
+    Bursts of updates are coalesced so the display is never redrawn more
+    than max_fps times per second; only the latest state is drawn.
+    """
+    min_frame_time = 1.0 / max_fps
+    drawn_version = None
+
+    while is_running():
+        if not state.wait(drawn_version, timeout=1.0):
+            continue
+
+        frame_start = time.monotonic()
+        version, text, symbol = state.snapshot()
+        render(text, symbol)
+        drawn_version = version
+
+        # Hold off the next frame so rapid ticks collapse into one redraw
+        elapsed = time.monotonic() - frame_start
+        if elapsed < min_frame_time:
+            time.sleep(min_frame_time - elapsed)
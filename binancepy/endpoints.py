@@ -0,0 +1,7 @@
+import os
+
+# Binance base URLs. Each can be overridden from the environment, e.g. to
+# point every tracker at the local stand-in started by mockserver.py
+SPOT_REST_URL = os.environ.get("BINANCE_API_URL", "https://api.binance.com")
+FUTURES_REST_URL = os.environ.get("BINANCE_FAPI_URL", "https://fapi.binance.com")
+FUTURES_WS_URL = os.environ.get("BINANCE_FSTREAM_URL", "wss://fstream.binance.com")
@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import endpoints
+from atomicfile import atomic_write_json
+
+EXCHANGE_INFO_URLS = {
+    "spot": f"{endpoints.SPOT_REST_URL}/api/v3/exchangeInfo",
+    "futures": f"{endpoints.FUTURES_REST_URL}/fapi/v1/exchangeInfo",
+}
+CACHE_PATH = os.path.expanduser("~/.cache/price_tracker/exchange_info.json")
+CACHE_TTL = 6 * 60 * 60  # Seconds before the cache is refreshed in the background
+
+def compact_symbol(info):
+    """Keep only the exchangeInfo fields the trackers use"""
+    filters = {f["filterType"]: f for f in info.get("filters", [])}
+    return {
+        "symbol": info["symbol"],
+        "baseAsset": info.get("baseAsset", ""),
+        "quoteAsset": info.get("quoteAsset", ""),
+        "status": info.get("status", ""),
+        "tickSize": filters.get("PRICE_FILTER", {}).get("tickSize"),
+        "stepSize": filters.get("LOT_SIZE", {}).get("stepSize"),
+    }
+
+def fetch_market(url, timeout=15):
+    """Download one exchangeInfo payload and compact its symbols"""
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return [compact_symbol(info) for info in response.json()["symbols"]]
+
+def fetch_markets(urls=None):
+    """Download every market's exchangeInfo in parallel"""
+    urls = urls or EXCHANGE_INFO_URLS
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        futures = {market: pool.submit(fetch_market, url) for market, url in urls.items()}
+        return {market: future.result() for market, future in futures.items()}
+
+def load_cache(path=CACHE_PATH):
+    """Return (fetched_at, markets) from disk, or None if missing/corrupt"""
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+        return cache["fetched_at"], cache["markets"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_cache(markets, path=CACHE_PATH):
+    """Write the cache atomically so a crash never leaves a partial file"""
+    atomic_write_json(path, {"fetched_at": time.time(), "markets": markets})
+
+def refresh(path=CACHE_PATH, on_refresh=None):
+    """Fetch fresh metadata, store it and hand it to on_refresh"""
+    try:
+        markets = fetch_markets()
+        save_cache(markets, path)
+    except Exception as e:
+        print(f"Error refreshing exchange info: {e}")
+        return None
+    if on_refresh:
+        on_refresh(markets)
+    return markets
+
+def get_markets(path=CACHE_PATH, ttl=CACHE_TTL, on_refresh=None):
+    """Symbol metadata per market, served from the disk cache when possible.
+
+    A cached copy is returned immediately without any network request;
+    if it is older than ttl a background thread refreshes it and calls
+    on_refresh(markets) when done. Only a missing cache blocks on the
+    (parallel) download.
+    """
+    cached = load_cache(path)
+    if cached is None:
+        return refresh(path) or {market: [] for market in EXCHANGE_INFO_URLS}
+
+    fetched_at, markets = cached
+    if time.time() - fetched_at > ttl:
+        thread = threading.Thread(target=refresh, args=(path, on_refresh))
+        thread.daemon = True
+        thread.start()
+    return markets
@@ -0,0 +1,34 @@
+class CountingSerial:
+    """Stand-in for luma's i2c interface that counts bus traffic.
+
+    Pass it to ssd1306() in place of i2c() to measure how many bytes a
+    display update would put on the bus, without any hardware. Every
+    write is framed like an SMBus block write: address byte, control
+    byte (0x00 command / 0x40 data), then at most block_size payload bytes.
+    """
+
+    def __init__(self, block_size=32):
+        self.block_size = block_size
+        self.reset()
+
+    def reset(self):
+        """Zero the counters and forget recorded writes"""
+        self.bytes_sent = 0
+        self.transactions = 0
+        self.commands = []
+        self.data_bytes = bytearray()
+
+    def command(self, *cmd):
+        self.commands.append(cmd)
+        self.transactions += 1
+        self.bytes_sent += 2 + len(cmd)
+
+    def data(self, data):
+        self.data_bytes.extend(data)
+        for i in range(0, len(data), self.block_size):
+            chunk = data[i:i + self.block_size]
+            self.transactions += 1
+            self.bytes_sent += 2 + len(chunk)
+
+    def cleanup(self):
+        pass
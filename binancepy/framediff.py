@@ -0,0 +1,92 @@
+from PIL import Image
+
+# SSD1306 addressing commands (horizontal addressing mode is set by luma)
+COLUMNADDR = 0x21
+PAGEADDR = 0x22
+# Cost of one COLUMNADDR/PAGEADDR window command on the bus
+WINDOW_COST = 6
+
+# Byte with its bits mirrored, so the top row of a page lands in bit 0
+_REVERSE_BITS = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+def frame_pages(image, pages):
+    """Pack a 1-bit image into SSD1306 pages, one bytes object per page"""
+    # Transposing turns each column into a row of packed bytes, one per
+    # page; mirroring the bits matches the controller's LSB-at-top order
+    columns = image.transpose(Image.Transpose.TRANSPOSE).tobytes().translate(_REVERSE_BITS)
+    return [columns[page::pages] for page in range(pages)]
+
+def dirty_span(old, new):
+    """First and last differing column of a page, or None if unchanged"""
+    if old == new:
+        return None
+    start = 0
+    while old[start] == new[start]:
+        start += 1
+    end = len(new) - 1
+    while old[end] == new[end]:
+        end -= 1
+    return start, end
+
+class DiffingDevice:
+    """Wraps a luma ssd1306 device and sends only what changed.
+
+    Each frame is compared page by page with the last one sent. Only the
+    changed column range of each dirty page is written, using the
+    controller's column/page address window; when the dirty pages are
+    close together a single bounding window is cheaper and used instead.
+    Everything else is forwarded to the wrapped device.
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self._pages = device.height // 8
+        self._colstart = getattr(device, "_colstart", 0)
+        self._last = None
+
+    def __getattr__(self, name):
+        return getattr(self.device, name)
+
+    def invalidate(self):
+        """Force the next frame to be sent in full, e.g. after clear()"""
+        self._last = None
+
+    def display(self, image):
+        image = self.device.preprocess(image)
+        pages = frame_pages(image.convert("1"), self._pages)
+        last = self._last
+        self._last = pages
+
+        if last is None:
+            self._write(0, self._pages - 1, 0, self.device.width - 1, pages)
+            return
+
+        spans = []
+        for page in range(self._pages):
+            span = dirty_span(last[page], pages[page])
+            if span:
+                spans.append((page, span[0], span[1]))
+        if not spans:
+            return
+
+        first_page, last_page = spans[0][0], spans[-1][0]
+        start = min(span[1] for span in spans)
+        end = max(span[2] for span in spans)
+        per_page_cost = sum(WINDOW_COST + end_col - start_col + 1 for _, start_col, end_col in spans)
+        window_cost = WINDOW_COST + (last_page - first_page + 1) * (end - start + 1)
+
+        if window_cost <= per_page_cost:
+            self._write(first_page, last_page, start, end, pages)
+        else:
+            for page, start_col, end_col in spans:
+                self._write(page, page, start_col, end_col, pages)
+
+    def _write(self, first_page, last_page, start, end, pages):
+        """Send columns start..end of pages first_page..last_page"""
+        self.device.command(
+            COLUMNADDR, self._colstart + start, self._colstart + end,
+            PAGEADDR, first_page, last_page)
+        data = bytearray()
+        for page in range(first_page, last_page + 1):
+            data += pages[page][start:end + 1]
+        self.device.data(list(data))
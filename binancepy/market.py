@@ -0,0 +1,156 @@
+"""Headless all-market feed: every futures symbol from one array stream.
+
+Subscribes to !miniTicker@arr (or the larger !ticker@arr) and keeps the
+last price, 24h open/change and volume of every symbol in preallocated
+NumPy columns. Each array frame is applied as one vectorized batch, and
+a one-line market summary is printed every few seconds instead of per
+message.
+
+Usage: python market.py [--stream miniTicker|ticker] [--interval 10]
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+import websockets
+import endpoints
+import parsers
+
+RECONNECT_DELAY = 5
+INITIAL_CAPACITY = 512  # Binance futures lists a few hundred symbols; columns double when full
+
+ARRAY_STREAMS = {
+    "miniTicker": "!miniTicker@arr",
+    "ticker": "!ticker@arr",
+}
+
+def array_stream_url(kind="miniTicker"):
+    return f"{endpoints.FUTURES_WS_URL}/ws/{ARRAY_STREAMS[kind]}"
+
+class MarketTable:
+    """Per-symbol columns indexed through a symbol -> slot map"""
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.slots = {}
+        self.symbols = []
+        self.price = np.full(capacity, np.nan)
+        self.open = np.full(capacity, np.nan)
+        self.volume = np.zeros(capacity)
+        self.quote_volume = np.zeros(capacity)
+        self.event_time = np.zeros(capacity, dtype=np.int64)
+        self.batches = 0
+        self.last_message = time.monotonic()
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _grow(self):
+        capacity = len(self.price) * 2
+        for name, fill in (("price", np.nan), ("open", np.nan), ("volume", 0),
+                           ("quote_volume", 0), ("event_time", 0)):
+            old = getattr(self, name)
+            column = np.full(capacity, fill, dtype=old.dtype)
+            column[:len(old)] = old
+            setattr(self, name, column)
+
+    def slot(self, symbol):
+        """Slot of a symbol, allocating one the first time it is seen"""
+        slot = self.slots.get(symbol)
+        if slot is None:
+            slot = self.slots[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            if slot >= len(self.price):
+                self._grow()
+        return slot
+
+    def apply(self, tickers):
+        """Write a batch of (mini)ticker payloads into the columns.
+
+        Only the symbol lookup is per item; the string -> float
+        conversion and the column writes happen once per batch.
+        """
+        if not tickers:
+            return np.empty(0, dtype=np.intp)
+        slots = np.fromiter((self.slot(t['s']) for t in tickers), np.intp, len(tickers))
+        self.price[slots] = np.array([t['c'] for t in tickers], dtype=np.float64)
+        self.open[slots] = np.array([t['o'] for t in tickers], dtype=np.float64)
+        self.volume[slots] = np.array([t['v'] for t in tickers], dtype=np.float64)
+        self.quote_volume[slots] = np.array([t['q'] for t in tickers], dtype=np.float64)
+        self.event_time[slots] = [t['E'] for t in tickers]
+        self.batches += 1
+        self.last_message = time.monotonic()
+        return slots
+
+    def change(self):
+        """24h change in percent for every allocated slot"""
+        count = len(self.symbols)
+        return (self.price[:count] / self.open[:count] - 1) * 100
+
+    def get(self, symbol):
+        """(price, change %, volume) of one symbol, or None if never seen"""
+        slot = self.slots.get(symbol)
+        if slot is None:
+            return None
+        return (float(self.price[slot]),
+                float((self.price[slot] / self.open[slot] - 1) * 100),
+                float(self.volume[slot]))
+
+    def summary(self):
+        count = len(self.symbols)
+        if not count:
+            return "no symbols yet"
+        change = self.change()
+        return (f"{count} symbols, {int(np.sum(change > 0))} up / {int(np.sum(change < 0))} down, "
+                f"median {np.nanmedian(change):+.2f}%, "
+                f"quote volume {np.sum(self.quote_volume[:count]):,.0f}")
+
+def handle_frame(table, message):
+    """Apply one array frame (str or bytes); returns the slots written"""
+    data = parsers.decode(message)
+    if isinstance(data, dict):
+        data = data.get('data')
+    if isinstance(data, list):
+        return table.apply(data)
+    return None
+
+async def stream(table, kind="miniTicker", on_batch=None):
+    """Feed the table from the array stream, reconnecting on drops.
+
+    on_batch(slots) is called after each frame with the slots it wrote.
+    """
+    while True:
+        try:
+            async with websockets.connect(array_stream_url(kind), ping_interval=30, ping_timeout=10) as ws:
+                print(f"WebSocket connection established ({ARRAY_STREAMS[kind]})")
+                while True:
+                    slots = handle_frame(table, await ws.recv(decode=False))
+                    if on_batch and slots is not None:
+                        on_batch(slots)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"WebSocket error: {e}")
+        await asyncio.sleep(RECONNECT_DELAY)
+
+async def report(table, interval=10):
+    while True:
+        await asyncio.sleep(interval)
+        print(f"[{time.strftime('%H:%M:%S')}] {table.summary()}")
+
+async def run(table, kind="miniTicker", interval=10):
+    await asyncio.gather(stream(table, kind), report(table, interval))
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless all-market ticker feed")
+    parser.add_argument("--stream", choices=sorted(ARRAY_STREAMS), default="miniTicker")
+    parser.add_argument("--interval", type=float, default=10, help="seconds between summaries")
+    args = parser.parse_args()
+
+    table = MarketTable()
+    try:
+        asyncio.run(run(table, args.stream, args.interval))
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""Local stand-in for the Binance endpoints the trackers use.
+
+Serves futures @ticker, @bookTicker, @aggTrade and @markPrice@1s
+streams and the all-market !ticker@arr / !miniTicker@arr arrays
+(combined /stream?streams=... and single /ws/<stream>, with live
+SUBSCRIBE/UNSUBSCRIBE) plus the REST /ticker/price, /klines and
+exchangeInfo endpoints of both markets and CoinMarketCap's v2 quotes
+and v4 DEX pair quotes, all from one random-walk market, with
+X-MBX-USED-WEIGHT-1M accounting. Message rate, latency,
+disconnects and stalls are configurable (for all connections or a
+random share of them), so reconnects, failover, throughput and the
+watchdog can be exercised without internet access.
+
+Usage: python mockserver.py [--rate 10] [--latency 0.05] [--stall-every 60 --stall-for 40 [--fault-ratio 0.5]]
+then point the trackers at it with the environment variables it prints.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import websockets
+from ratelimit import klines_weight
+
+DEFAULT_SYMBOLS = "FARTCOINUSDT,PNUTUSDT,MELANIAUSDT,POPCATUSDT,BTCUSDT,ETHUSDT"
+INTERVAL_UNITS = {"s": 1000, "m": 60000, "h": 3600000, "d": 86400000}
+
+def compact(payload):
+    """JSON without spaces, as Binance sends it"""
+    return json.dumps(payload, separators=(",", ":"))
+
+class MarketSim:
+    """Random-walk prices and 24h statistics shared by WS and REST"""
+
+    def __init__(self, symbols, volatility=0.001):
+        self.volatility = volatility
+        self.lock = threading.Lock()
+        self.state = {}
+        self.activity = {}  # Per-symbol volatility factor for the REST walk
+        self.last_drift = {}
+        for symbol in symbols:
+            self.activity[symbol] = random.lognormvariate(0, 0.7)
+            price = random.uniform(0.1, 2.0) if not symbol.startswith(("BTC", "ETH")) else random.uniform(2000, 90000)
+            self.state[symbol] = {"open": price, "price": price, "high": price, "low": price,
+                                  "volume": 0.0, "quote_volume": 0.0, "trades": 0}
+
+    def step(self, symbol, scale=1.0):
+        """Move one symbol's price and return its new state"""
+        with self.lock:
+            s = self.state[symbol]
+            s["price"] *= 1 + random.gauss(0, self.volatility * scale)
+            quantity = random.uniform(1, 1000)
+            s["high"] = max(s["high"], s["price"])
+            s["low"] = min(s["low"], s["price"])
+            s["volume"] += quantity
+            s["quote_volume"] += quantity * s["price"]
+            s["trades"] += 1
+            return dict(s)
+
+    def drift(self, symbol):
+        """Step scaled to the time since the last REST poll, so the
+        volatility per second doesn't depend on how often it is polled"""
+        now = time.monotonic()
+        with self.lock:
+            elapsed = now - self.last_drift.get(symbol, now - 1)
+            self.last_drift[symbol] = now
+        return self.step(symbol, self.activity[symbol] * math.sqrt(elapsed))
+
+    def price(self, symbol):
+        with self.lock:
+            return self.state[symbol]["price"]
+
+    def ticker(self, symbol):
+        """24hr ticker payload in Binance's field layout"""
+        s = self.step(symbol)
+        now = int(time.time() * 1000)
+        change = s["price"] - s["open"]
+        return {
+            "e": "24hrTicker", "E": now, "s": symbol,
+            "p": f"{change:.8f}", "P": f"{change / s['open'] * 100:.3f}",
+            "w": f"{s['quote_volume'] / max(s['volume'], 1):.8f}",
+            "c": f"{s['price']:.8f}", "Q": "1.0", "o": f"{s['open']:.8f}",
+            "h": f"{s['high']:.8f}", "l": f"{s['low']:.8f}",
+            "v": f"{s['volume']:.3f}", "q": f"{s['quote_volume']:.3f}",
+            "O": now - 86400000, "C": now, "F": 1, "L": s["trades"], "n": s["trades"],
+        }
+
+    def mini_ticker(self, symbol):
+        """24hr miniTicker payload"""
+        s = self.step(symbol)
+        return {
+            "e": "24hrMiniTicker", "E": int(time.time() * 1000), "s": symbol,
+            "c": f"{s['price']:.8f}", "o": f"{s['open']:.8f}",
+            "h": f"{s['high']:.8f}", "l": f"{s['low']:.8f}",
+            "v": f"{s['volume']:.3f}", "q": f"{s['quote_volume']:.3f}",
+        }
+
+    def book_ticker(self, symbol):
+        """bookTicker payload: best bid/ask a few ticks either side of the price"""
+        s = self.step(symbol)
+        now = int(time.time() * 1000)
+        half_spread = s["price"] * random.uniform(0.00005, 0.0005)
+        return {
+            "e": "bookTicker", "u": s["trades"], "E": now, "T": now, "s": symbol,
+            "b": f"{s['price'] - half_spread:.8f}", "B": f"{random.uniform(1, 1000):.3f}",
+            "a": f"{s['price'] + half_spread:.8f}", "A": f"{random.uniform(1, 1000):.3f}",
+        }
+
+    def agg_trade(self, symbol):
+        """aggTrade payload for one simulated trade"""
+        s = self.step(symbol)
+        now = int(time.time() * 1000)
+        return {
+            "e": "aggTrade", "E": now, "a": s["trades"], "s": symbol,
+            "p": f"{s['price']:.8f}", "q": f"{random.uniform(1, 1000):.3f}",
+            "f": s["trades"], "l": s["trades"], "T": now, "m": random.random() < 0.5,
+        }
+
+    def mark_price(self, symbol):
+        """markPriceUpdate payload"""
+        s = self.step(symbol)
+        now = int(time.time() * 1000)
+        return {
+            "e": "markPriceUpdate", "E": now, "s": symbol,
+            "p": f"{s['price']:.8f}", "i": f"{s['price']:.8f}", "P": f"{s['price']:.8f}",
+            "r": "0.00010000", "T": now - now % 28800000 + 28800000,
+        }
+
+    def payload(self, stream):
+        """Payload for a stream name like btcusdt@bookTicker, or None if unknown"""
+        if stream == "!ticker@arr":
+            return [self.ticker(symbol) for symbol in self.state]
+        if stream == "!miniTicker@arr":
+            return [self.mini_ticker(symbol) for symbol in self.state]
+        symbol, _, kind = stream.partition("@")
+        symbol = symbol.upper()
+        if symbol not in self.state:
+            return None
+        make = {"ticker": self.ticker, "bookTicker": self.book_ticker,
+                "aggTrade": self.agg_trade, "markPrice@1s": self.mark_price,
+                "markPrice": self.mark_price}.get(kind)
+        return make(symbol) if make else None
+
+    def klines(self, symbol, interval, start_ms=None, end_ms=None, limit=500):
+        """Kline rows in Binance's array layout. History is a deterministic
+        wave plus noise per open time, so repeated requests agree."""
+        step = int(interval[:-1]) * INTERVAL_UNITS[interval[-1]]
+        now = int(time.time() * 1000)
+        end_ms = min(end_ms or now, now)
+        first = start_ms if start_ms is not None else end_ms - (limit - 1) * step
+        first -= first % step
+        base = self.state[symbol]["open"]
+        rows = []
+        for open_ms in range(first, end_ms + 1, step)[:limit]:
+            rng = random.Random(f"{symbol}{open_ms}")
+            close = base * (1 + 0.02 * math.sin(open_ms / 3600000) + rng.gauss(0, 0.002))
+            open_ = base * (1 + 0.02 * math.sin((open_ms - step) / 3600000))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, 0.001)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, 0.001)))
+            volume = rng.uniform(100, 10000)
+            rows.append([open_ms, f"{open_:.8f}", f"{high:.8f}", f"{low:.8f}", f"{close:.8f}",
+                         f"{volume:.3f}", open_ms + step - 1, f"{volume * close:.3f}",
+                         rng.randint(10, 500), f"{volume / 2:.3f}", f"{volume * close / 2:.3f}", "0"])
+        return rows
+
+    def exchange_info(self):
+        return {"symbols": [{
+            "symbol": symbol, "status": "TRADING",
+            "baseAsset": symbol[:-4], "quoteAsset": symbol[-4:],
+            "filters": [
+                {"filterType": "PRICE_FILTER", "tickSize": "0.00010000"},
+                {"filterType": "LOT_SIZE", "stepSize": "1.00000000"},
+            ],
+        } for symbol in self.state]}
+
+def parse_streams(path):
+    """(stream names, combined?) from a /stream?streams=... or /ws/... path"""
+    url = urlparse(path)
+    if url.path.startswith("/stream"):
+        streams = parse_qs(url.query).get("streams", [""])[0]
+        return [s for s in streams.split("/") if s], True
+    return [url.path[len("/ws/"):]], False
+
+async def handle_stream(ws, sim, config):
+    streams, combined = parse_streams(ws.request.path)
+    subscribed = set(streams)
+    connected_at = time.monotonic()
+    faulty = random.random() < config.fault_ratio  # Whether stalls/disconnects apply to this client
+    print(f"WS client connected{' (faulty)' if faulty and config.fault_ratio < 1 else ''}: {', '.join(streams)}")
+
+    async def read_requests():
+        async for message in ws:
+            request = json.loads(message)
+            params = request.get("params", [])
+            if request.get("method") == "SUBSCRIBE":
+                subscribed.update(params)
+            elif request.get("method") == "UNSUBSCRIBE":
+                subscribed.difference_update(params)
+            await ws.send(compact({"result": None, "id": request.get("id")}))
+
+    reader = asyncio.create_task(read_requests())
+    try:
+        while True:
+            await asyncio.sleep(1 / config.rate)
+            alive = time.monotonic() - connected_at
+
+            if faulty and config.disconnect_after and alive > config.disconnect_after:
+                print("WS: dropping client")
+                return
+
+            # Keep the socket open but silent for the last stall_for seconds of each period
+            if faulty and config.stall_every and alive % config.stall_every > config.stall_every - config.stall_for:
+                continue
+
+            if config.latency or config.jitter:
+                await asyncio.sleep(config.latency + random.uniform(0, config.jitter))
+
+            for stream in list(subscribed):
+                payload = sim.payload(stream)
+                if payload is None:
+                    continue
+                await ws.send(compact({"stream": stream, "data": payload} if combined else payload))
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        reader.cancel()
+
+class WeightMeter:
+    """Request weight used in the current minute, as Binance counts it"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.minute = None
+        self.used = 0
+
+    def add(self, weight):
+        """Count a request; returns (used, allowed?)"""
+        with self.lock:
+            minute = int(time.time() // 60)
+            if minute != self.minute:
+                self.minute, self.used = minute, 0
+            self.used += weight
+            return self.used, self.used <= self.limit
+
+def make_rest_handler(sim, config):
+    meter = WeightMeter(config.weight_limit)
+
+    class RestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if config.latency or config.jitter:
+                time.sleep(config.latency + random.uniform(0, config.jitter))
+
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            self.used, allowed = meter.add(self.weight(url.path, query))
+            if not allowed:
+                self.reply(429, {"code": -1003, "msg": "Too many requests."})
+            elif url.path in ("/api/v3/ticker/price", "/fapi/v1/ticker/price"):
+                symbol = query.get("symbol", [None])[0]
+                if symbol is None:
+                    self.reply(200, [self.price(s) for s in sim.state])
+                elif symbol in sim.state:
+                    self.reply(200, self.price(symbol))
+                else:
+                    self.reply(400, {"code": -1121, "msg": "Invalid symbol."})
+            elif url.path in ("/api/v3/klines", "/fapi/v1/klines"):
+                symbol = query.get("symbol", [None])[0]
+                if symbol not in sim.state:
+                    self.reply(400, {"code": -1121, "msg": "Invalid symbol."})
+                    return
+                start = query.get("startTime", [None])[0]
+                end = query.get("endTime", [None])[0]
+                limit = min(int(query.get("limit", ["500"])[0]), 1500)
+                self.reply(200, sim.klines(symbol, query.get("interval", ["1m"])[0],
+                                           int(start) if start else None, int(end) if end else None, limit))
+            elif url.path in ("/api/v3/exchangeInfo", "/fapi/v1/exchangeInfo"):
+                self.reply(200, sim.exchange_info())
+            elif url.path in ("/v2/cryptocurrency/quotes/latest", "/v4/dex/pairs/quotes/latest"):
+                self.reply(200, self.cmc_quotes(url.path, query))
+            else:
+                self.reply(404, {"code": -1, "msg": "Not found."})
+
+        def weight(self, path, query):
+            if path.endswith("/klines"):
+                return klines_weight(int(query.get("limit", ["500"])[0]))
+            if path.endswith("/ticker/price") and "symbol" not in query:
+                return 2
+            return 1
+
+        def cmc_quotes(self, path, query):
+            """CoinMarketCap v2 quotes / v4 DEX pairs; FARTCOIN (or a DEX
+            "contract address" of FARTCOIN) is priced as FARTCOINUSDT"""
+            dex = path.startswith("/v4/")
+            keys = query.get("contract_address" if dex else "symbol", [""])[0].split(",")
+            updated = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+            quotes = {key: {"price": sim.drift(f"{key}USDT")["price"], "last_updated": updated}
+                      for key in keys if f"{key}USDT" in sim.state}
+            if dex:
+                data = [{"contract_address": key, "base_asset_symbol": key, "quote": [quote]}
+                        for key, quote in quotes.items()]
+            else:
+                data = {key: [{"symbol": key, "quote": {"USD": quote}}] for key, quote in quotes.items()}
+            status = {"timestamp": updated, "error_code": 0, "error_message": None,
+                      "credit_count": math.ceil(len(keys) / 100)}
+            return {"status": status, "data": data}
+
+        def price(self, symbol):
+            return {"symbol": symbol, "price": f"{sim.drift(symbol)['price']:.8f}",
+                    "time": int(time.time() * 1000)}
+
+        def reply(self, status, payload):
+            body = compact(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-MBX-USED-WEIGHT-1M", str(self.used))
+            if status == 429:
+                self.send_header("Retry-After", str(int(60 - time.time() % 60) + 1))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return RestHandler
+
+async def serve(config):
+    symbols = config.symbols.split(",") + [f"SIM{i:04d}USDT" for i in range(config.extra_symbols)]
+    sim = MarketSim(symbols, config.volatility)
+
+    rest = ThreadingHTTPServer((config.host, config.http_port), make_rest_handler(sim, config))
+    rest_thread = threading.Thread(target=rest.serve_forever)
+    rest_thread.daemon = True
+    rest_thread.start()
+
+    async with websockets.serve(lambda ws: handle_stream(ws, sim, config), config.host, config.ws_port):
+        print("Mock Binance running. Point the trackers at it with:")
+        print(f"  export BINANCE_FSTREAM_URL=ws://{config.host}:{config.ws_port}")
+        print(f"  export BINANCE_FAPI_URL=http://{config.host}:{config.http_port}")
+        print(f"  export BINANCE_API_URL=http://{config.host}:{config.http_port}")
+        print(f"  export CMC_API_URL=http://{config.host}:{config.http_port}")
+        try:
+            await asyncio.Future()
+        finally:
+            rest.shutdown()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local Binance stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--ws-port", type=int, default=9443)
+    parser.add_argument("--http-port", type=int, default=8080)
+    parser.add_argument("--symbols", default=DEFAULT_SYMBOLS, help="comma-separated symbols")
+    parser.add_argument("--extra-symbols", type=int, default=0, help="add N synthetic symbols (for !ticker@arr load)")
+    parser.add_argument("--weight-limit", type=int, default=2400, help="request weight per minute before 429s")
+    parser.add_argument("--rate", type=float, default=1.0, help="messages/sec per stream")
+    parser.add_argument("--volatility", type=float, default=0.001, help="std dev of each price step")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added before each send/reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, up to this many seconds")
+    parser.add_argument("--disconnect-after", type=float, default=0.0, help="drop WS clients after N seconds")
+    parser.add_argument("--stall-every", type=float, default=0.0, help="stall period in seconds")
+    parser.add_argument("--stall-for", type=float, default=0.0, help="silent seconds per stall period")
+    parser.add_argument("--fault-ratio", type=float, default=1.0,
+                        help="share of WS clients that get the disconnects/stalls")
+    return parser.parse_args(argv)
+
+def main():
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import threading
+import time
+
+class LazyDisplay:
+    """SSD1306 + Renderer, initialised once in a background thread.
+
+    Importing luma/PIL, opening I2C and rasterising the glyph atlas take
+    seconds on a Pi Zero, so start() does it off the main thread while
+    the tracker restores its snapshot and connects. show() never waits
+    for it: until the device is usable only the latest frame is kept,
+    and drawn as soon as it is; without one, on_ready() (if given) runs
+    instead (e.g. to draw the restored screen).
+    """
+
+    def __init__(self, port=1, address=0x3C, width=128, height=32):
+        self.port = port
+        self.address = address
+        self.width = width
+        self.height = height
+        self.device = None
+        self.renderer = None
+        self.error = None
+        self.ready = threading.Event()
+        self.lock = threading.Lock()  # The init thread may draw while the tracker does
+        self.pending = None  # Latest frame shown before the device was ready
+
+    def start(self, on_ready=None):
+        thread = threading.Thread(target=self._init, args=(on_ready,))
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def _init(self, on_ready):
+        start = time.monotonic()
+        try:
+            from luma.core.interface.serial import i2c
+            from luma.oled.device import ssd1306
+            from framediff import DiffingDevice
+            from render import Renderer
+
+            serial = i2c(port=self.port, address=self.address)
+            # Only the pages/columns that changed since the last frame go over I2C
+            self.device = DiffingDevice(ssd1306(serial, width=self.width, height=self.height))
+            self.renderer = Renderer()  # Fonts, border and glyphs are prepared once here
+            print(f"Display ready in {time.monotonic() - start:.2f}s")
+        except Exception as e:
+            self.error = e
+            print(f"Display init error: {e}")
+        with self.lock:
+            self.ready.set()
+            pending, self.pending = self.pending, None
+            # Drawn under the lock, so no newer frame can be overwritten by it
+            if pending is not None and self.error is None:
+                try:
+                    self.device.display(self.renderer.render(*pending))
+                except Exception as e:
+                    print(f"Display error: {e}")
+        if on_ready and pending is None and self.error is None:
+            on_ready()
+
+    def show(self, lines, images=()):
+        """Render text lines/images (see Renderer.render) and push them.
+
+        Before the device is ready the frame is only kept for later, so
+        callers on the event loop never block on the init.
+        """
+        with self.lock:
+            if not self.ready.is_set():
+                self.pending = (lines, images)
+                return
+            if self.error is not None:
+                raise RuntimeError(f"display unavailable ({self.error})")
+            self.device.display(self.renderer.render(lines, images))
@@ -0,0 +1,186 @@
+import json
+from collections import namedtuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Frames shorter than this may be control replies; array frames open
+# their '[' within this many characters
+SHORT_FRAME = 96
+
+# One price update, whatever stream it came from; bid/ask only from bookTicker
+Tick = namedtuple("Tick", "symbol event_time price volume bid ask", defaults=(None, None))
+
+def decode(message):
+    """Decode a JSON frame (str or bytes), with orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(message)
+    return json.loads(message)
+
+def ticker_to_tick(ticker):
+    return Tick(ticker['s'], ticker['E'], float(ticker['c']), float(ticker['v']))
+
+def parse_ticker_json(message):
+    """Full-decode parser for @ticker and !ticker@arr frames.
+
+    Returns a list of Ticks, or None for non-data frames such as
+    SUBSCRIBE replies.
+    """
+    data = decode(message)
+    if isinstance(data, dict):
+        if 'id' in data:
+            return None
+        data = data.get('data', data)
+    if isinstance(data, list):
+        return [ticker_to_tick(ticker) for ticker in data]
+    return [ticker_to_tick(data)]
+
+class _Fields:
+    """Search patterns for the ticker fields, as str or bytes"""
+
+    def __init__(self, kind):
+        encode = (lambda text: text) if kind is str else (lambda text: text.encode())
+        self.symbol = encode('"s":"')
+        self.price = encode('"c":"')
+        self.volume = encode('"v":"')
+        self.event_time = encode('"E":')
+        self.result = encode('"result":')
+        self.quote = encode('"')
+        self.comma = encode(',')
+        self.array = encode('[')
+
+_FIELDS = {str: _Fields(str), bytes: _Fields(bytes)}
+
+def _after(message, pattern):
+    index = message.find(pattern)
+    if index < 0:
+        raise KeyError(pattern)
+    return index + len(pattern)
+
+def parse_ticker_fast(message):
+    """Targeted parser for single @ticker frames.
+
+    Finds just the symbol, close price, volume and event time in the raw
+    frame instead of decoding all ~20 fields. Works on bytes as well as
+    str, so binary frames need no decoding copy; float() and int() take
+    bytes directly. Array frames and anything not laid out like
+    Binance's compact JSON fall back to parse_ticker_json.
+    """
+    fields = _FIELDS[type(message)]
+
+    # SUBSCRIBE replies are tiny; only short frames need the check
+    if len(message) < SHORT_FRAME and message.find(fields.result) >= 0:
+        return None
+
+    # Array frames ([...] or {"stream":"!ticker@arr","data":[...]}) open
+    # their '[' within the first few bytes, so only that prefix is scanned
+    if message.find(fields.array, 0, SHORT_FRAME) >= 0:
+        return parse_ticker_json(message)
+
+    try:
+        start = _after(message, fields.symbol)
+        symbol = message[start:message.index(fields.quote, start)]
+        start = _after(message, fields.price)
+        price = float(message[start:message.index(fields.quote, start)])
+        start = _after(message, fields.volume)
+        volume = float(message[start:message.index(fields.quote, start)])
+        start = _after(message, fields.event_time)
+        event_time = int(message[start:message.index(fields.comma, start)])
+    except (KeyError, ValueError):
+        # Unexpected layout (e.g. pretty-printed JSON): decode it properly
+        return parse_ticker_json(message)
+
+    if not isinstance(symbol, str):
+        symbol = symbol.decode()
+    return [Tick(symbol, event_time, price, volume)]
+
+def _payloads(message):
+    """Stream payloads of a frame, or None for SUBSCRIBE replies"""
+    data = decode(message)
+    if isinstance(data, dict):
+        if 'id' in data:
+            return None
+        data = data.get('data', data)
+    return data if isinstance(data, list) else [data]
+
+def parse_book_ticker(message):
+    """@bookTicker: best bid/ask on every change; price is the mid"""
+    payloads = _payloads(message)
+    if payloads is None:
+        return None
+    ticks = []
+    for book in payloads:
+        bid = float(book['b'])
+        ask = float(book['a'])
+        ticks.append(Tick(book['s'], book.get('E', book.get('T', 0)), (bid + ask) / 2, 0.0, bid, ask))
+    return ticks
+
+def parse_agg_trade(message):
+    """@aggTrade: last traded price and quantity"""
+    payloads = _payloads(message)
+    if payloads is None:
+        return None
+    return [Tick(trade['s'], trade['E'], float(trade['p']), float(trade['q'])) for trade in payloads]
+
+def parse_mark_price(message):
+    """@markPrice@1s: futures mark price once a second"""
+    payloads = _payloads(message)
+    if payloads is None:
+        return None
+    return [Tick(mark['s'], mark['E'], float(mark['p']), 0.0) for mark in payloads]
+
+PARSERS = {
+    "json": parse_ticker_json,
+    "fast": parse_ticker_fast,
+}
+
+# orjson's full decode beats the pure-Python field scan; without it the
+# targeted parser is about twice as fast as json.loads
+DEFAULT_PARSER = parse_ticker_json if orjson is not None else parse_ticker_fast
+
+def get_parser(name=None):
+    return PARSERS[name] if name else DEFAULT_PARSER
+
+class StreamMode:
+    """Which stream to subscribe per pair, how to parse it and what to show.
+
+    display is "price" (last/mark/mid price) or "spread", which shows
+    the mid price with the bid/ask spread in basis points when the
+    stream carries a book (bookTicker).
+    """
+
+    def __init__(self, suffix, parser, display="price", quiet_after=3.0):
+        self.suffix = suffix
+        self.parser = parser
+        self.display = display
+        # Seconds without fresh events before the connection counts as stalled
+        self.quiet_after = quiet_after
+        # @ticker volume is the running 24h total, not a per-tick quantity
+        self.cumulative_volume = suffix == "@ticker"
+
+    def stream(self, pair):
+        return f"{pair}{self.suffix}"
+
+    def format(self, tick):
+        if self.display == "spread" and tick.bid is not None:
+            spread_bps = (tick.ask - tick.bid) / tick.price * 10000
+            return f"${tick.price:,.4f} {spread_bps:.1f}bp"
+        return f"${tick.price:,.4f}"
+
+# Stream name suffix, parser and stall threshold per mode. @ticker is a
+# ~20-field 24h summary about once a second, but only when the 24h
+# numbers changed, so a quiet pair can skip several seconds; the others
+# are smaller and arrive as the book or trades change, so quiet spells
+# are normal for them (mark price: once a second, futures only)
+STREAM_MODES = {
+    "ticker": ("@ticker", DEFAULT_PARSER, 10.0),
+    "bookTicker": ("@bookTicker", parse_book_ticker, 10.0),
+    "aggTrade": ("@aggTrade", parse_agg_trade, 30.0),
+    "markPrice": ("@markPrice@1s", parse_mark_price, 3.0),
+}
+
+def stream_mode(name="ticker", display="price"):
+    suffix, parser, quiet_after = STREAM_MODES[name]
+    return StreamMode(suffix, parser, display, quiet_after)
@@ -0,0 +1,124 @@
+"""Polls the prices of many symbols over one pooled HTTP session.
+
+Keep-alive connections are reused between polls. A small watch list is
+fetched with concurrent per-symbol requests; once that would cost more
+weight than the all-symbols /ticker/price, one request covers every
+symbol. The request weight reported by Binance is respected, so
+polling dozens of symbols as a fallback never runs into 429s.
+
+Usage: python poller.py SYMBOL [SYMBOL ...] [--market futures] [--interval 5]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+import endpoints
+from ratelimit import WEIGHT_LIMITS, WeightBudget
+
+TICKER_URLS = {
+    "spot": f"{endpoints.SPOT_REST_URL}/api/v3/ticker/price",
+    "futures": f"{endpoints.FUTURES_REST_URL}/fapi/v1/ticker/price",
+}
+# Request weight of (one symbol, all symbols)
+TICKER_WEIGHTS = {"spot": (2, 4), "futures": (1, 2)}
+POOL_SIZE = 8  # Concurrent requests (and kept-alive connections)
+TIMEOUT = 10
+
+def make_session(pool_size=POOL_SIZE):
+    """requests.Session keeping up to pool_size connections alive"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class PricePoller:
+    """Latest prices of a watch list from one market's /ticker/price"""
+
+    def __init__(self, market="futures", session=None, budget=None, pool_size=POOL_SIZE):
+        self.market = market
+        self.url = TICKER_URLS[market]
+        self.session = session or make_session(pool_size)
+        self.budget = budget or WeightBudget(WEIGHT_LIMITS[market], name=f"Poller ({market})")
+        self.pool = ThreadPoolExecutor(max_workers=pool_size)
+        self.requests = 0
+        self.spent = 0  # Request weight used so far
+
+    def _get(self, params, weight):
+        self.budget.acquire(weight)
+        response = self.session.get(self.url, params=params, timeout=TIMEOUT)
+        self.requests += 1
+        self.spent += weight
+        self.budget.report(response)
+        response.raise_for_status()
+        return response.json()
+
+    def batched(self, count):
+        """Whether count symbols are cheaper in one all-symbols request"""
+        single, everything = TICKER_WEIGHTS[self.market]
+        return count * single > everything
+
+    def weight(self, count):
+        """Request weight of polling count symbols"""
+        single, everything = TICKER_WEIGHTS[self.market]
+        return min(count * single, everything)
+
+    def poll(self, symbols):
+        """{symbol: (price, event time ms)} for the symbols that could be fetched"""
+        symbols = [symbol.upper() for symbol in symbols]
+        if not symbols:
+            return {}
+        single, everything = TICKER_WEIGHTS[self.market]
+        if self.batched(len(symbols)):
+            try:
+                rows = self._get({}, everything)
+            except Exception as e:
+                print(f"Error fetching prices: {e}")
+                return {}
+        else:
+            futures = [(symbol, self.pool.submit(self._get, {"symbol": symbol}, single)) for symbol in symbols]
+            rows = []
+            for symbol, future in futures:
+                try:
+                    rows.append(future.result())
+                except Exception as e:
+                    print(f"Error fetching {symbol}: {e}")
+
+        wanted = set(symbols)
+        now = int(time.time() * 1000)
+        # Spot rows carry no time
+        return {row["symbol"]: (float(row["price"]), row.get("time", now))
+                for row in rows if row["symbol"] in wanted}
+
+    def close(self):
+        self.pool.shutdown(wait=False)
+        self.session.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll many symbols' prices")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--market", default="futures", choices=sorted(TICKER_URLS))
+    parser.add_argument("--interval", type=float, default=5, help="seconds between polls")
+    args = parser.parse_args()
+
+    poller = PricePoller(args.market)
+    print(f"Polling {len(args.symbols)} {args.market} symbols every {args.interval}s "
+          f"({'one all-symbols request' if poller.batched(len(args.symbols)) else 'one request per symbol'})")
+    try:
+        while True:
+            start = time.monotonic()
+            prices = poller.poll(args.symbols)
+            stamp = time.strftime("%H:%M:%S")
+            for symbol, (price, _) in sorted(prices.items()):
+                print(f"[{stamp}] {symbol}: {price:,.8g}")
+            print(f"  {len(prices)}/{len(args.symbols)} in {time.monotonic() - start:.2f}s, "
+                  f"{poller.requests} requests (weight {poller.spent}), weight left {poller.budget.remaining():.0f}")
+            time.sleep(max(args.interval - (time.monotonic() - start), 0))
+    except KeyboardInterrupt:
+        print("\nPolling stopped")
+    finally:
+        poller.close()
+
+if __name__ == "__main__":
+    main()
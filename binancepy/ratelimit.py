@@ -0,0 +1,70 @@
+import threading
+import time
+
+# Request weight per minute per IP
+WEIGHT_LIMITS = {"spot": 6000, "futures": 2400}
+WEIGHT_SHARE = 0.5  # Leave half the minute's weight to everything else on this IP
+RETRY_AFTER = 60  # Seconds to back off after a 418/429 without a Retry-After header
+
+def klines_weight(limit):
+    """Futures /klines request weight for a page size"""
+    return 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+
+class WeightBudget:
+    """Request-weight accounting shared by the threads of one client.
+
+    Requests take weight from a share of the per-minute limit and block
+    once it is used up; the server's own count (X-MBX-USED-WEIGHT-1M)
+    replaces the local one whenever it is higher, so other programs on
+    the same IP are accounted for too.
+    """
+
+    def __init__(self, limit=WEIGHT_LIMITS["futures"], share=WEIGHT_SHARE, name="REST"):
+        self.allowed = limit * share
+        self.name = name
+        self.lock = threading.Lock()
+        self.used = 0
+        self.minute = int(time.time() // 60)
+        self.blocked_until = 0.0
+
+    def _roll(self):
+        minute = int(time.time() // 60)
+        if minute != self.minute:
+            self.minute, self.used = minute, 0
+
+    def acquire(self, weight):
+        """Block until weight fits in this minute's share"""
+        while True:
+            with self.lock:
+                self._roll()
+                if time.time() >= self.blocked_until and self.used + weight <= self.allowed:
+                    self.used += weight
+                    return
+                wait_for = max(self.blocked_until, (self.minute + 1) * 60) - time.time()
+            print(f"{self.name}: weight budget used, waiting {wait_for:.0f}s")
+            time.sleep(max(wait_for, 0.01))
+
+    def report(self, response):
+        """Adopt the server's weight count, and back off if it refused the request"""
+        used = response.headers.get("X-MBX-USED-WEIGHT-1M")
+        with self.lock:
+            self._roll()
+            if used is not None:
+                self.used = max(self.used, int(used))
+            if response.status_code in (418, 429):
+                retry_after = float(response.headers.get("Retry-After", RETRY_AFTER))
+                self.blocked_until = max(self.blocked_until, time.time() + retry_after)
+
+    def remaining(self):
+        """Weight still available in this minute's share"""
+        with self.lock:
+            self._roll()
+            if time.time() < self.blocked_until:
+                return 0
+            return max(self.allowed - self.used, 0)
+
+    def reset_in(self):
+        """Seconds until the weight count starts over"""
+        with self.lock:
+            self._roll()
+            return max(self.blocked_until, (self.minute + 1) * 60) - time.time()
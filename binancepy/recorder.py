@@ -0,0 +1,171 @@
+import bisect
+import glob
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from atomicfile import atomic_write_json
+
+# One tick: symbol id, exchange event time (ms), receive time (ms), price, volume
+RECORD = struct.Struct("<Iqqdd")
+# Segment header: magic, record count
+HEADER = struct.Struct("<4sQ")
+MAGIC = b"TICK"
+SEGMENT_RECORDS = 1 << 18  # ~9 MB per segment
+QUEUE_SIZE = 100000  # Ticks buffered for the writer before new ones are dropped
+BATCH_SIZE = 4096
+
+def segment_name(first_receive_ms, sequence):
+    return f"ticks-{first_receive_ms:013d}-{sequence:06d}.bin"
+
+def segment_start(path):
+    """First receive time (ms) of a segment, from its file name"""
+    return int(os.path.basename(path).split("-")[1])
+
+class TickRecorder:
+    """Appends ticks to memory-mapped, fixed-size segment files.
+
+    record() only puts a tuple on a bounded queue, so it never blocks the
+    WebSocket task; a background thread packs batches into the current
+    segment and rotates to a new file when it is full. If the writer
+    falls behind by more than QUEUE_SIZE ticks, new ticks are counted in
+    dropped instead of growing memory.
+    """
+
+    def __init__(self, directory, segment_records=SEGMENT_RECORDS):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+
+        # Segments store ids only, so a lost map must never be started over
+        self._symbols_path = os.path.join(directory, "symbols.json")
+        try:
+            with open(self._symbols_path) as f:
+                self._symbol_ids = json.load(f)
+        except FileNotFoundError:
+            self._symbol_ids = {}
+        except ValueError as e:
+            raise ValueError(f"{self._symbols_path} is corrupt, refusing to reuse its symbol ids") from e
+
+        self._queue = queue.Queue(QUEUE_SIZE)
+        self._map = None
+        self._file = None
+        self._count = 0
+        self._sequence = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._write_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def record(self, symbol, event_time, price, volume):
+        """Queue one tick; event_time is the exchange 'E' field in ms"""
+        try:
+            self._queue.put_nowait((symbol, event_time, time.time_ns() // 1000000, price, volume))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Flush queued ticks and close the current segment"""
+        self._running = False
+        self._thread.join()
+
+    def _symbol_id(self, symbol):
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self._symbol_ids)
+            atomic_write_json(self._symbols_path, self._symbol_ids)
+        return symbol_id
+
+    def _write_loop(self):
+        while self._running or not self._queue.empty():
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+        self._close_segment()
+
+    def _write_batch(self, batch):
+        for symbol, event_time, receive_time, price, volume in batch:
+            if self._map is None or self._count == self.segment_records:
+                self._open_segment(receive_time)
+            offset = HEADER.size + self._count * RECORD.size
+            RECORD.pack_into(self._map, offset, self._symbol_id(symbol), event_time, receive_time, price, volume)
+            self._count += 1
+        # Publish the new count once per batch so readers never see half a record
+        HEADER.pack_into(self._map, 0, MAGIC, self._count)
+
+    def _open_segment(self, first_receive_ms):
+        self._close_segment()
+        path = os.path.join(self.directory, segment_name(first_receive_ms, self._sequence))
+        self._sequence += 1
+        self._file = open(path, "w+b")
+        self._file.truncate(HEADER.size + self.segment_records * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._count = 0
+        HEADER.pack_into(self._map, 0, MAGIC, 0)
+
+    def _close_segment(self):
+        if self._map is not None:
+            HEADER.pack_into(self._map, 0, MAGIC, self._count)
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+class _ReceiveTimes:
+    """Sequence view of a segment's receive times, for bisect"""
+
+    def __init__(self, data, count):
+        self.data = data
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)[2]
+
+class TickReader:
+    """Reads ticks written by TickRecorder, by receive-time range"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "symbols.json")) as f:
+            self.symbols = {symbol_id: symbol for symbol, symbol_id in json.load(f).items()}
+
+    def segments(self):
+        """Segment paths in time order"""
+        return sorted(glob.glob(os.path.join(self.directory, "ticks-*.bin")))
+
+    def read(self, start_ms=0, end_ms=None, symbol=None):
+        """Yield (symbol, event_ms, receive_ms, price, volume) in [start_ms, end_ms)"""
+        end_ms = end_ms if end_ms is not None else 1 << 62
+        paths = self.segments()
+        starts = [segment_start(path) for path in paths]
+
+        # Skip segments that end before start_ms (the next one starts earlier)
+        first = max(bisect.bisect_left(starts, start_ms) - 1, 0)
+        for path, first_receive_ms in zip(paths[first:], starts[first:]):
+            if first_receive_ms >= end_ms:
+                break
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, count = HEADER.unpack_from(data, 0)
+                if magic != MAGIC:
+                    continue
+                times = _ReceiveTimes(data, count)
+                index = bisect.bisect_left(times, start_ms)
+                end_index = bisect.bisect_left(times, end_ms)
+                for record in RECORD.iter_unpack(data[HEADER.size + index * RECORD.size:HEADER.size + end_index * RECORD.size]):
+                    name = self.symbols.get(record[0])
+                    if symbol is None or name == symbol:
+                        yield (name,) + record[1:]
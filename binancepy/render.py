@@ -0,0 +1,76 @@
+import math
+from PIL import Image, ImageDraw, ImageFont
+
+# Characters every price and status string is built from
+PRICE_CHARS = "$0123456789,.-"
+STATUS_TEXTS = [
+    "Connecting",
+    "Connected",
+    "Disconnected",
+    "Reconnecting...",
+    "Error: WS",
+    "Waiting...",
+    "Initializing...",
+    "Switching...",
+]
+SYMBOL_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ/"
+
+class Renderer:
+    """Draws text frames for the OLED from a cached glyph atlas.
+
+    Fonts are loaded and the bordered background is drawn once. Each
+    glyph is rasterised the first time it is used and then only pasted,
+    so a frame costs one background copy plus one paste per character.
+    Kerning and sub-pixel placement are ignored, so spacing can differ
+    from ImageDraw.text() by a pixel. The returned image is reused
+    between frames.
+    """
+
+    def __init__(self, width=128, height=32, border=True):
+        self.fonts = {
+            "small": ImageFont.load_default(),
+            "large": ImageFont.load_default(size=24),
+        }
+
+        self.background = Image.new("1", (width, height), "black")
+        if border:
+            draw = ImageDraw.Draw(self.background)
+            draw.rectangle((0, 0, width - 1, height - 1), outline="white", fill="black")
+        self._buffer = self.background.copy()
+
+        # (font name, char) -> (glyph mask, advance in pixels)
+        self._glyphs = {}
+        preload = PRICE_CHARS + SYMBOL_CHARS + "".join(STATUS_TEXTS)
+        for font_name in self.fonts:
+            for char in set(preload):
+                self._glyph(font_name, char)
+
+    def _glyph(self, font_name, char):
+        """Return the cached glyph for char, rasterising it on first use"""
+        key = (font_name, char)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            font = self.fonts[font_name]
+            advance = font.getlength(char)
+            left, top, right, bottom = font.getbbox(char)
+            size = (max(right, math.ceil(advance), 1), max(bottom, 1))
+            mask = Image.new("1", size, "black")
+            ImageDraw.Draw(mask).text((0, 0), char, font=font, fill="white")
+            glyph = (mask, advance)
+            self._glyphs[key] = glyph
+        return glyph
+
+    def render(self, lines, images=()):
+        """Render [((x, y), font name, text), ...] and [((x, y), image), ...]"""
+        frame = self._buffer
+        frame.paste(self.background)
+        for position, image in images:
+            frame.paste(image, position)
+        for (x, y), font_name, text in lines:
+            cursor = x
+            for char in str(text):
+                mask, advance = self._glyph(font_name, char)
+                if char != " ":
+                    frame.paste(255, (round(cursor), y), mask)
+                cursor += advance
+        return frame
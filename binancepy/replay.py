@@ -0,0 +1,190 @@
+"""Replay recorded ticks through the live message -> display path.
+
+Feeds a TickRecorder directory or a JSONL capture (one stream message
+per line) into aio_runtime.handle_message and the real render task, at
+recorded speed, N times faster, or as fast as possible, then reports
+what each stage sustained and where the streams went stale (judged in
+recorded time, as the live watchdog would). The display is a
+DiffingDevice over a counting fake serial, so no hardware is needed.
+
+Usage: python replay.py PATH [--speed N|max] [--pairs a,b] [--fps N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from luma.oled.device import ssd1306
+import aio_runtime
+import parsers
+from fakeserial import CountingSerial
+from framediff import DiffingDevice
+from mockserver import compact
+from recorder import TickReader
+from render import Renderer
+from supervisor import StaleStreams, StreamHealth
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+def tick_message(symbol, event_ms, price, volume):
+    """Combined-stream @ticker message carrying a recorded tick"""
+    return compact({
+        "stream": f"{symbol.lower()}@ticker",
+        "data": {"e": "24hrTicker", "E": event_ms, "s": symbol, "c": repr(price), "v": repr(volume)},
+    })
+
+def recorded_events(directory, start_ms=0, end_ms=None):
+    """(receive ms, message) for every tick in a recorder directory"""
+    for symbol, event_ms, receive_ms, price, volume in TickReader(directory).read(start_ms, end_ms):
+        yield receive_ms, tick_message(symbol, event_ms, price, volume)
+
+def capture_events(path):
+    """(event ms, message) for every line of a JSONL capture.
+
+    Lines may be combined-stream messages or bare ticker payloads;
+    bare payloads are wrapped so handle_message sees the live format.
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if 'data' not in data:
+                data = {"stream": f"{data['s'].lower()}@ticker", "data": data}
+                line = compact(data)
+            yield data['data'].get('E', 0), line
+
+class StageStats:
+    """Per-stage timings collected during a replay"""
+
+    def __init__(self):
+        self.parse = []
+        self.render = []
+        self.latency = []
+        self.max_lag = 0.0
+        self.messages = 0
+        self.frames = 0
+        self.stalls = []  # (stream, last event ms before, seconds), see StaleStreams
+
+    def report(self, elapsed, serial):
+        print(f"messages: {self.messages} in {elapsed:.2f}s ({self.messages / elapsed:,.0f} msg/s)")
+        print(f"frames:   {self.frames} ({self.frames / elapsed:,.1f} fps)")
+        for name, samples in (("parse", self.parse), ("render", self.render), ("tick->pixel", self.latency)):
+            if not samples:
+                continue
+            line = (f"{name:>12}: p50 {percentile(samples, 0.5) * 1e6:9.1f} us  "
+                    f"p99 {percentile(samples, 0.99) * 1e6:9.1f} us  "
+                    f"max {max(samples) * 1e6:9.1f} us")
+            if samples is not self.latency:
+                line += f"  sustains {len(samples) / sum(samples):,.0f}/s"
+            print(line)
+        print(f"max schedule lag: {self.max_lag * 1000:.1f} ms")
+        print(f"bus bytes: {serial.bytes_sent} ({serial.bytes_sent / max(self.frames, 1):.1f}/frame)")
+        print(f"stalls:   {len(self.stalls)}")
+        for stream, started, seconds in self.stalls:
+            stamp = time.strftime("%H:%M:%S", time.gmtime(started / 1000))
+            print(f"  {stream}: {seconds:.1f}s from {stamp} UTC")
+
+async def replay(events, board, show, speed=1.0, max_fps=10, quiet_after=parsers.stream_mode().quiet_after):
+    """Drive handle_message and the render task from events.
+
+    speed is the time multiplier (1 = as recorded); None replays as fast
+    as the pipeline allows. Streams silent for quiet_after seconds of
+    recorded time are reported as stalls. Returns (StageStats, elapsed
+    seconds).
+    """
+    stats = StageStats()
+    pending_since = None
+    # The board's health runs on the recording's clock, whatever the speed
+    replay_ms = 0
+    board.health = StreamHealth(clock=lambda: replay_ms)
+    stale = StaleStreams(board.health, quiet_after)
+    stats.stalls = stale.windows
+
+    def timed_show(text, symbol):
+        nonlocal pending_since
+        start = time.perf_counter()
+        show(text, symbol)
+        end = time.perf_counter()
+        stats.render.append(end - start)
+        stats.frames += 1
+        if pending_since is not None:
+            stats.latency.append(end - pending_since)
+            pending_since = None
+
+    tasks = [asyncio.create_task(aio_runtime.render(board, timed_show, max_fps))]
+
+    wall_start = time.perf_counter()
+    first_ms = None
+    try:
+        for event_ms, message in events:
+            if first_ms is None:
+                first_ms = event_ms
+            if speed:
+                due = wall_start + (event_ms - first_ms) / 1000 / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    stats.max_lag = max(stats.max_lag, -delay)
+
+            # Checked before and after each message, so a gap is seen
+            # going stale and ending on the message that closes it
+            replay_ms = event_ms
+            stale.check()
+            start = time.perf_counter()
+            aio_runtime.handle_message(board, message)
+            end = time.perf_counter()
+            stale.check()
+            stats.parse.append(end - start)
+            stats.messages += 1
+            if board.changed.is_set() and pending_since is None:
+                pending_since = end
+
+            # Let the render task run even at max speed
+            await asyncio.sleep(0)
+
+        # Allow the final frame through the fps limiter
+        await asyncio.sleep(2.0 / max_fps)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return stats, time.perf_counter() - wall_start
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay ticks through the display path")
+    parser.add_argument("path", help="TickRecorder directory or JSONL capture")
+    parser.add_argument("--speed", default="1", help="time multiplier, or 'max'")
+    parser.add_argument("--pairs", help="comma-separated pairs to show (default: first seen)")
+    parser.add_argument("--fps", type=int, default=10, help="render frame limit")
+    args = parser.parse_args()
+
+    events = recorded_events(args.path) if os.path.isdir(args.path) else capture_events(args.path)
+    events = list(events)
+    if args.pairs:
+        pairs = args.pairs.lower().split(",")
+    else:
+        first = json.loads(events[0][1])['data']['s'] if events else ""
+        pairs = [first.lower()]
+
+    serial = CountingSerial()
+    device = DiffingDevice(ssd1306(serial, width=128, height=32))
+    serial.reset()
+    renderer = Renderer()
+
+    def show(text, symbol):
+        device.display(renderer.render([((3, 1), "small", symbol), ((3, 14), "small", text)]))
+
+    speed = None if args.speed == "max" else float(args.speed)
+    board = aio_runtime.PriceBoard(pairs)
+    stats, elapsed = asyncio.run(replay(events, board, show, speed, args.fps))
+    stats.report(elapsed, serial)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Adaptive poll timing for the REST trackers.
+
+Each symbol's next poll comes from its recent volatility: the interval
+is about how long the price takes to move TARGET_MOVE, within
+[min_interval, max_interval]. Displayed symbols and symbols close to an
+alert level are polled PRIORITY_SPEEDUP times as often. What is spent
+is capped twice: by a token bucket refilled at weight_rate (e.g. what
+the old fixed interval used, so the total never grows) and by the
+request weight Binance says is left this minute. When either runs
+short, every interval is stretched by the same factor, so priorities
+hold.
+"""
+import math
+import time
+
+TARGET_MOVE = 0.001  # Relative price move one poll interval should roughly cover
+PRIORITY_SPEEDUP = 4  # Displayed / near-alert symbols are polled this much more often
+NEAR_ALERT = 3  # "Near" an alert level: within this many TARGET_MOVEs of it
+VOLATILITY_WEIGHT = 0.1  # EWMA weight of each new return
+BURST_SECONDS = 60  # Unspent weight saved up for volatile spells, in seconds of weight_rate
+
+class SymbolSchedule:
+    """Recent price, volatility and next due time of one symbol"""
+
+    def __init__(self):
+        self.price = None
+        self.time = None  # ms
+        self.variance = None  # Of log returns, per second
+        self.observations = 0
+        self.due = 0.0  # monotonic
+        self.alerts = []
+        self.shown = False
+
+    def observe(self, price, time_ms):
+        """Add a polled price; returns the alert levels it crossed"""
+        crossed = []
+        if self.price is not None and time_ms > self.time:
+            sample = math.log(price / self.price) ** 2 / ((time_ms - self.time) / 1000)
+            self.variance = sample if self.variance is None else self.variance + VOLATILITY_WEIGHT * (sample - self.variance)
+            crossed = [level for level in self.alerts if min(self.price, price) < level <= max(self.price, price)]
+        if self.time is None or time_ms > self.time:
+            self.price, self.time = price, time_ms
+            self.observations += 1
+        return crossed
+
+    def near_alert(self, target_move):
+        return self.price is not None and any(
+            abs(level - self.price) < NEAR_ALERT * target_move * self.price for level in self.alerts)
+
+class PollScheduler:
+    """Decides which of a poller's symbols to fetch, and when"""
+
+    def __init__(self, poller, symbols, min_interval=1.0, max_interval=60.0, weight_rate=None,
+                 target_move=TARGET_MOVE, on_alert=None):
+        self.poller = poller
+        self.symbols = {symbol.upper(): SymbolSchedule() for symbol in symbols}
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.weight_rate = weight_rate  # Average request weight per second, None for no cap
+        self.target_move = target_move
+        self.on_alert = on_alert or (lambda symbol, level, price: None)
+        self.credit = 0.0  # Saved up from quiet spells only, so the total stays within weight_rate
+        self.refilled = time.monotonic()
+
+    def set_shown(self, symbols):
+        shown = {symbol.upper() for symbol in symbols}
+        for symbol, schedule in self.symbols.items():
+            schedule.shown = symbol in shown
+
+    def set_alerts(self, symbol, levels):
+        self.symbols[symbol.upper()].alerts = sorted(levels)
+
+    def interval(self, symbol):
+        """Seconds between polls of a symbol before any budget stretch"""
+        schedule = self.symbols[symbol]
+        if schedule.observations < 2 or schedule.variance is None:
+            interval = self.min_interval  # Measure the volatility first
+        elif schedule.variance <= 0:
+            interval = self.max_interval
+        else:
+            # Log returns spread with sqrt(time), so TARGET_MOVE takes move^2 / variance seconds
+            interval = self.target_move ** 2 / schedule.variance
+        if schedule.shown or schedule.near_alert(self.target_move):
+            interval /= PRIORITY_SPEEDUP
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def demand(self, intervals):
+        """Request weight per second the intervals would use"""
+        if not intervals:
+            return 0.0
+        one_by_one = sum(self.poller.weight(1) / interval for interval in intervals.values())
+        batched = self.poller.weight(len(intervals)) / min(intervals.values())
+        return min(one_by_one, batched)
+
+    def stretch(self, intervals):
+        """Factor every interval is multiplied by to stay within the budgets"""
+        budget = self.poller.budget
+        allowed = budget.remaining() / max(budget.reset_in(), 1)
+        if self.weight_rate is not None and self.credit < self.poller.weight(len(intervals)):
+            allowed = min(allowed, self.weight_rate)
+        if allowed <= 0:
+            return math.inf
+        return max(1.0, self.demand(intervals) / allowed)
+
+    def _refill(self):
+        if self.weight_rate is None:
+            return
+        now = time.monotonic()
+        self.credit = min(self.credit + (now - self.refilled) * self.weight_rate, self.weight_rate * BURST_SECONDS)
+        self.refilled = now
+
+    def poll(self, symbols=None):
+        """Fetch the due symbols (or the given ones); returns {symbol: (price, time ms)}"""
+        self._refill()
+        now = time.monotonic()
+        if symbols is None:
+            symbols = [symbol for symbol, schedule in self.symbols.items() if schedule.due <= now]
+        else:
+            symbols = [symbol.upper() for symbol in symbols]
+        if not symbols:
+            return {}
+        # One all-symbols request costs the same however many it covers
+        if self.poller.batched(len(symbols)):
+            symbols = list(self.symbols)
+
+        prices = self.poller.poll(symbols)
+        self.credit -= self.poller.weight(len(symbols))
+        for symbol, (price, time_ms) in prices.items():
+            for level in self.symbols[symbol].observe(price, time_ms):
+                self.on_alert(symbol, level, price)
+
+        intervals = {symbol: self.interval(symbol) for symbol in self.symbols}
+        stretch = self.stretch(intervals)
+        reset_in = self.poller.budget.reset_in()
+        now = time.monotonic()
+        # Symbols that failed are retried on their normal schedule too
+        for symbol in symbols:
+            self.symbols[symbol].due = now + min(intervals[symbol] * stretch, max(self.max_interval, reset_in))
+        return prices
+
+    def wait(self):
+        """Seconds until the next symbol is due"""
+        return max(min(schedule.due for schedule in self.symbols.values()) - time.monotonic(), 0.0)
+
+    def run(self, on_prices, running=lambda: True, tick=1.0):
+        """Poll until running() turns false, sleeping at most tick at a time"""
+        while running():
+            prices = self.poll()
+            if prices:
+                on_prices(prices)
+            time.sleep(min(self.wait(), tick))
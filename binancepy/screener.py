@@ -0,0 +1,198 @@
+"""Top movers across the whole futures market, cycled on the OLED.
+
+Feeds market.py's all-market stream into three indexed heaps (24h
+gainers, losers and quote-volume leaders). Each ticker update moves one
+entry per heap in O(log n); the top k are read off the heap without
+sorting the universe. The OLED cycles through the top k of each list.
+
+Usage: python screener.py [--top 3] [--interval 3] [--headless]
+"""
+import argparse
+import asyncio
+import heapq
+import math
+import market
+
+class IndexedHeap:
+    """Binary max-heap of keys with a key -> position index.
+
+    update() inserts or moves a key in O(log n); top(k) walks the heap
+    in O(k log k) without modifying it.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.values = []
+        self.position = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _swap(self, i, j):
+        keys, values = self.keys, self.values
+        keys[i], keys[j] = keys[j], keys[i]
+        values[i], values[j] = values[j], values[i]
+        self.position[keys[i]] = i
+        self.position[keys[j]] = j
+
+    def _sift_up(self, i):
+        values = self.values
+        while i:
+            parent = (i - 1) >> 1
+            if values[parent] >= values[i]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        values = self.values
+        count = len(values)
+        while True:
+            largest = i
+            left = 2 * i + 1
+            if left < count and values[left] > values[largest]:
+                largest = left
+            if left + 1 < count and values[left + 1] > values[largest]:
+                largest = left + 1
+            if largest == i:
+                return
+            self._swap(i, largest)
+            i = largest
+
+    def update(self, key, value):
+        i = self.position.get(key)
+        if i is None:
+            self.position[key] = len(self.keys)
+            self.keys.append(key)
+            self.values.append(value)
+            self._sift_up(len(self.keys) - 1)
+            return
+        old = self.values[i]
+        self.values[i] = value
+        if value > old:
+            self._sift_up(i)
+        elif value < old:
+            self._sift_down(i)
+
+    def remove(self, key):
+        i = self.position.pop(key, None)
+        if i is None:
+            return
+        last = len(self.keys) - 1
+        if i != last:
+            self.keys[i] = self.keys[last]
+            self.values[i] = self.values[last]
+            self.position[self.keys[i]] = i
+        self.keys.pop()
+        self.values.pop()
+        if i != last:
+            self._sift_down(i)
+            self._sift_up(i)
+
+    def top(self, k):
+        """[(key, value)] of the k largest values, largest first"""
+        result = []
+        if not self.keys:
+            return result
+        frontier = [(-self.values[0], 0)]
+        while frontier and len(result) < k:
+            _, i = heapq.heappop(frontier)
+            result.append((self.keys[i], self.values[i]))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self.keys):
+                    heapq.heappush(frontier, (-self.values[child], child))
+        return result
+
+# List name -> (title on the OLED, sign applied to make it a max-heap)
+LISTS = {
+    "gainers": ("Top gainers", 1),
+    "losers": ("Top losers", -1),
+    "volume": ("Top volume", 1),
+}
+
+class Screener:
+    """Gainers, losers and volume leaders kept current tick by tick"""
+
+    def __init__(self):
+        self.heaps = {name: IndexedHeap() for name in LISTS}
+
+    def update(self, symbol, change, quote_volume):
+        """Record one symbol's 24h change (%) and quote volume"""
+        if math.isfinite(change):
+            self.heaps["gainers"].update(symbol, change)
+            self.heaps["losers"].update(symbol, -change)
+        self.heaps["volume"].update(symbol, quote_volume)
+
+    def remove(self, symbol):
+        for heap in self.heaps.values():
+            heap.remove(symbol)
+
+    def apply(self, table, slots):
+        """Update from the MarketTable slots a batch just wrote"""
+        price, open_, quote_volume = table.price, table.open, table.quote_volume
+        symbols = table.symbols
+        for slot in slots.tolist():
+            change = (price[slot] / open_[slot] - 1) * 100 if open_[slot] else math.nan
+            self.update(symbols[slot], float(change), float(quote_volume[slot]))
+
+    def top(self, name, k=3):
+        """[(symbol, value)] for one list; losers come back as negative %"""
+        sign = LISTS[name][1]
+        return [(symbol, value * sign) for symbol, value in self.heaps[name].top(k)]
+
+def format_entry(name, rank, symbol, value):
+    if name == "volume":
+        if value >= 1e9:
+            return f"{rank} {symbol} {value / 1e9:.1f}B"
+        return f"{rank} {symbol} {value / 1e6:.1f}M"
+    return f"{rank} {symbol} {value:+.2f}%"
+
+async def cycle(screener, show, top=3, interval=3):
+    """Show each list's top entries in turn: show(text, title)"""
+    while True:
+        shown = False
+        for name, (title, _) in LISTS.items():
+            entries = screener.top(name, top)
+            for rank, (symbol, value) in enumerate(entries, 1):
+                show(format_entry(name, rank, symbol, value), f"{title} {rank}/{len(entries)}")
+                shown = True
+                await asyncio.sleep(interval)
+        if not shown:
+            await asyncio.sleep(interval)
+
+async def run(screener, table, show, kind="miniTicker", top=3, interval=3):
+    await asyncio.gather(
+        market.stream(table, kind, on_batch=lambda slots: screener.apply(table, slots)),
+        cycle(screener, show, top, interval),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Top movers screener")
+    parser.add_argument("--stream", choices=sorted(market.ARRAY_STREAMS), default="miniTicker")
+    parser.add_argument("--top", type=int, default=3, help="entries shown per list")
+    parser.add_argument("--interval", type=float, default=3, help="seconds per entry")
+    parser.add_argument("--headless", action="store_true", help="print instead of using the OLED")
+    args = parser.parse_args()
+
+    if args.headless:
+        def show(text, title):
+            print(f"{title}: {text}")
+    else:
+        from luma.core.interface.serial import i2c
+        from luma.oled.device import ssd1306
+        from framediff import DiffingDevice
+        from render import Renderer
+
+        device = DiffingDevice(ssd1306(i2c(port=1, address=0x3C), width=128, height=32))
+        renderer = Renderer()
+
+        def show(text, title):
+            device.display(renderer.render([((3, 1), "small", title), ((3, 14), "small", text)]))
+
+    try:
+        asyncio.run(run(Screener(), market.MarketTable(), show, args.stream, args.top, args.interval))
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json
+import os
+import time
+from atomicfile import atomic_write_json
+
+SNAPSHOT_DIR = os.path.expanduser("~/.cache/price_tracker")
+SNAPSHOT_INTERVAL = 30  # Seconds between snapshots while running
+STALE_MARK = "~"  # Prefix for prices restored from a snapshot until live ones arrive
+
+def snapshot_path(name):
+    """Snapshot file of one tracker script"""
+    return os.path.join(SNAPSHOT_DIR, f"snapshot-{name}.json")
+
+def state(pairs, index, prices):
+    """What a tracker needs to redraw its last screen"""
+    return {
+        "saved_at": time.time(),
+        "pairs": list(pairs),
+        "index": index,
+        "prices": {pair: text.lstrip(STALE_MARK) for pair, text in prices.items()},
+        "labels": {pair: pair.upper().replace('USDT', '/USDT') for pair in pairs},
+    }
+
+def save(path, snapshot):
+    """Write the snapshot atomically so a power cut never leaves a partial file"""
+    atomic_write_json(path, snapshot)
+
+def load(path):
+    """The saved snapshot, or None if missing/corrupt"""
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+        snapshot["prices"], snapshot["pairs"], snapshot["index"]
+        return snapshot
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def stale(text):
+    return text if text.startswith(STALE_MARK) else STALE_MARK + text
+
+def save_board(board, path):
+    try:
+        save(path, state(board.pairs, board.index, board.prices))
+    except OSError as e:
+        print(f"Snapshot error: {e}")
+
+def restore_board(board, snapshot):
+    """Put a snapshot's prices (marked stale) and selected pair on a PriceBoard"""
+    for pair in board.pairs:
+        text = snapshot["prices"].get(pair)
+        if text and pair not in board.prices:
+            board.prices[pair] = stale(text)
+
+    pairs = snapshot["pairs"]
+    if 0 <= snapshot["index"] < len(pairs) and pairs[snapshot["index"]] in board.pairs:
+        board.index = board.pairs.index(pairs[snapshot["index"]])
+
+    # Show the restored price instead of "Connecting"; errors still replace it
+    if board.shown_pair in board.prices:
+        board.status = None
+    board.changed.set()
@@ -0,0 +1,165 @@
+import itertools
+import math
+import numpy as np
+from PIL import Image
+
+# Plot area inside the 1px border, below one line of small text
+WIDTH = 126
+HEIGHT = 18
+TICKS_PER_COLUMN = 4  # @ticker arrives about once a second: ~8 minutes across
+SCALE_PADDING = 0.1  # Headroom above/below the data, as a fraction of its range
+
+_versions = itertools.count(1)  # Shared, so a rebuilt chart never repeats an old version
+
+class Sparkline:
+    """Min/max sparkline of the most recent prices as a 1-bit plot.
+
+    Prices go into a fixed-size ring buffer. Every TICKS_PER_COLUMN
+    ticks become one column showing their min..max range, so spikes
+    survive the downsampling. The plot bitmap is cached: a tick normally
+    redraws only the newest column, and a new column shifts the bitmap
+    left by one. Only when the price leaves the padded scale (or the
+    range shrinks to under half of it) is everything replotted, in one
+    vectorized pass.
+    """
+
+    def __init__(self, width=WIDTH, height=HEIGHT, ticks_per_column=TICKS_PER_COLUMN):
+        self.width = width
+        self.height = height
+        self.ticks_per_column = ticks_per_column
+        self.ring = np.full(width * ticks_per_column, np.nan)
+        self.count = 0
+        self.partial = 0  # Ticks in the newest column
+        self.col_min = np.full(width, np.nan)
+        self.col_max = np.full(width, np.nan)
+        self.low = self.high = math.nan
+        self.rows = np.zeros((height, width), dtype=bool)
+        self._rows_index = np.arange(height)[:, None]
+        self._image = None
+        self.replots = 0
+        self.version = 0  # Bumped whenever the plot changes, so renderers know to redraw
+
+    def append(self, price):
+        self.ring[self.count % len(self.ring)] = price
+        self.count += 1
+        if self.partial in (0, self.ticks_per_column):
+            # Start a new column: shift the columns and the cached plot left
+            self.col_min[:-1] = self.col_min[1:]
+            self.col_max[:-1] = self.col_max[1:]
+            self.rows[:, :-1] = self.rows[:, 1:]
+            self.col_min[-1] = self.col_max[-1] = price
+            self.partial = 1
+            changed = True
+        else:
+            changed = not self.col_min[-1] <= price <= self.col_max[-1]
+            self.col_min[-1] = min(self.col_min[-1], price)
+            self.col_max[-1] = max(self.col_max[-1], price)
+            self.partial += 1
+
+        if self._rescale():
+            changed = True
+        elif changed:
+            self.rows[:, -1] = self._plot(self.col_min[-1:], self.col_max[-1:])[:, 0]
+        if changed:
+            self._image = None
+            self.version = next(_versions)
+
+    def extend(self, prices):
+        """Append many prices at once (e.g. history) with a vectorized rebuild"""
+        prices = np.asarray(prices, dtype=np.float64)[-len(self.ring):]
+        if not len(prices):
+            return
+        size = len(self.ring)
+        positions = (self.count + np.arange(len(prices))) % size
+        self.ring[positions] = prices
+        self.count += len(prices)
+        self.rebuild()
+
+    def recent(self):
+        """Prices still in the ring buffer, oldest first"""
+        size = len(self.ring)
+        if self.count <= size:
+            return self.ring[:self.count]
+        start = self.count % size
+        return np.concatenate((self.ring[start:], self.ring[:start]))
+
+    def rebuild(self):
+        """Downsample the ring into columns and replot, all vectorized"""
+        if not self.count:
+            return
+        values = self.recent()
+        tpc = self.ticks_per_column
+        self.partial = (self.count - 1) % tpc + 1
+        full = values[:len(values) - self.partial]
+        full = full[len(full) % tpc:].reshape(-1, tpc)
+        newest = values[len(values) - self.partial:]
+        mins = np.append(full.min(axis=1), newest.min())[-self.width:]
+        maxs = np.append(full.max(axis=1), newest.max())[-self.width:]
+        self.col_min[:] = np.nan
+        self.col_max[:] = np.nan
+        self.col_min[-len(mins):] = mins
+        self.col_max[-len(maxs):] = maxs
+        self.low = self.high = math.nan
+        self._rescale(force=True)
+        self._image = None
+        self.version = next(_versions)
+
+    def _rescale(self, force=False):
+        """Replot everything if the data left the scale; True if it did"""
+        low = np.nanmin(self.col_min)
+        high = np.nanmax(self.col_max)
+        span = self.high - self.low
+        fits = low >= self.low and high <= self.high
+        if not force and fits and ((high - low) * 2 >= span or high == low):
+            return False
+        padding = (high - low) * SCALE_PADDING or abs(high) * 1e-4 or 1.0
+        self.low = low - padding
+        self.high = high + padding
+        self.rows[:] = self._plot(self.col_min, self.col_max)
+        self.replots += 1
+        return True
+
+    def _plot(self, lows, highs):
+        """(height, len(lows)) bool mask: each column filled from its min to max"""
+        scale = (self.height - 1) / (self.high - self.low)
+        with np.errstate(invalid="ignore"):
+            top = np.rint((self.high - highs) * scale)
+            bottom = np.rint((self.high - lows) * scale)
+            return (self._rows_index >= top) & (self._rows_index <= bottom)
+
+    def image(self):
+        """The plot as a PIL 1-bit image, rebuilt only after a change"""
+        if self._image is None:
+            packed = np.packbits(self.rows, axis=1)
+            self._image = Image.frombytes("1", (self.width, self.height), packed.tobytes())
+        return self._image
+
+class ChartBook:
+    """A Sparkline per symbol, fed like a StatsEngine (PriceBoard.charts)"""
+
+    def __init__(self, width=WIDTH, height=HEIGHT, ticks_per_column=TICKS_PER_COLUMN):
+        self.config = (width, height, ticks_per_column)
+        self.charts = {}
+
+    def update(self, symbol, time_ms, price, volume=0.0):
+        chart = self.charts.get(symbol)
+        if chart is None:
+            chart = self.charts[symbol] = Sparkline(*self.config)
+        chart.append(price)
+
+    def clear(self):
+        self.charts = {}
+
+    def seed(self, symbol, prices):
+        """Load history (e.g. kline closes) in one vectorized rebuild.
+
+        History columns hold ticks_per_column klines each and scroll out
+        as live ticks arrive.
+        """
+        chart = self.charts.get(symbol)
+        if chart is None:
+            chart = self.charts[symbol] = Sparkline(*self.config)
+        chart.extend(prices)
+
+    def get(self, symbol):
+        return self.charts.get(symbol)
@@ -0,0 +1,70 @@
+"""Import-time report for the tracker entry points.
+
+Runs `python -X importtime -c "import MODULE"` for each module in a
+fresh interpreter and prints the total plus the slowest imports, so
+anything heavy that creeps back to module level shows up. The entry
+points do no hardware or network work at import time, so they can be
+measured on any machine.
+
+Usage: python startup_report.py [MODULE ...] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ENTRY_POINTS = ["Pyt", "bawp", "bap", "market", "screener"]
+
+def import_times(module):
+    """[(cumulative us, self us, name)] from one -X importtime run"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+def module_tree(rows, module):
+    """Rows imported by `import module`: children come just before it"""
+    end = next(i for i in range(len(rows) - 1, -1, -1) if rows[i][2].strip() == module)
+    start = end
+    while start > 0 and rows[start - 1][2].startswith("  "):
+        start -= 1
+    return rows[end], rows[start:end]
+
+def report(module, top=10):
+    try:
+        rows = import_times(module)
+    except RuntimeError as e:
+        print(f"{module}: import failed: {e}\n")
+        return
+    (total, own, _), tree = module_tree(rows, module)
+    print(f"{module}: {total / 1000:.1f} ms ({own / 1000:.1f} ms in the module itself)")
+    # Direct imports (one indent level), slowest first
+    direct = [row for row in tree if row[2].startswith("  ") and not row[2].startswith("    ")]
+    for cumulative, _, name in sorted(direct, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name.strip()}")
+    if tree:
+        _, self_us, name = max(tree, key=lambda row: row[1])
+        print(f"  slowest single module: {name.strip()} ({self_us / 1000:.1f} ms self)")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time report for the entry points")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--top", type=int, default=10, help="imports listed per module")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report(module, args.top)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import math
+from collections import deque
+
+# Buckets per rolling window: memory per window is fixed no matter how
+# fast ticks arrive, at the cost of the window edge moving in steps of
+# window / WINDOW_BUCKETS
+WINDOW_BUCKETS = 120
+
+# Default timeframes, in seconds
+WINDOWS = (60, 300, 3600)
+CANDLES = ((60, 120), (300, 96), (3600, 48))  # (interval, closed candles kept)
+EMAS = (60, 900)  # time constants
+
+class RollingWindow:
+    """VWAP, min and max of the last `seconds` of ticks.
+
+    Ticks are folded into fixed-width buckets kept in a deque; running
+    sums give VWAP and monotonic deques of bucket highs/lows give the
+    sliding max/min, so every update is O(1) amortised.
+    """
+
+    def __init__(self, seconds, buckets=WINDOW_BUCKETS):
+        self.span_ms = int(seconds * 1000)
+        self.bucket_ms = max(1, self.span_ms // buckets)
+        self.buckets = deque()  # [start ms, high, low, price * volume, volume]
+        self.highs = deque()  # (start ms, high), highs decreasing
+        self.lows = deque()  # (start ms, low), lows increasing
+        self.pv = 0.0
+        self.volume = 0.0
+        self.traded = 0  # Buckets with volume in them
+
+    def add(self, time_ms, price, volume=0.0):
+        start = time_ms - time_ms % self.bucket_ms
+        buckets = self.buckets
+        if buckets and buckets[-1][0] >= start:
+            bucket = buckets[-1]  # Same bucket (or a late tick): fold it in
+            bucket[1] = max(bucket[1], price)
+            bucket[2] = min(bucket[2], price)
+            if volume > 0 and not bucket[4] > 0:
+                self.traded += 1
+            bucket[3] += price * volume
+            bucket[4] += volume
+            start = bucket[0]
+        else:
+            bucket = [start, price, price, price * volume, volume]
+            buckets.append(bucket)
+            if volume > 0:
+                self.traded += 1
+        self.pv += price * volume
+        self.volume += volume
+
+        highs, lows = self.highs, self.lows
+        while highs and highs[-1][1] <= bucket[1]:
+            highs.pop()
+        highs.append((start, bucket[1]))
+        while lows and lows[-1][1] >= bucket[2]:
+            lows.pop()
+        lows.append((start, bucket[2]))
+
+        self._expire(time_ms)
+
+    def _expire(self, now_ms):
+        cutoff = now_ms - self.span_ms
+        buckets = self.buckets
+        while buckets and buckets[0][0] + self.bucket_ms <= cutoff:
+            old = buckets.popleft()
+            self.pv -= old[3]
+            self.volume -= old[4]
+            if old[4] > 0:
+                self.traded -= 1
+            if self.highs[0][0] == old[0]:
+                self.highs.popleft()
+            if self.lows[0][0] == old[0]:
+                self.lows.popleft()
+        if not self.traded:
+            self.pv = self.volume = 0.0  # Drop accumulated float drift
+
+    def high(self):
+        return self.highs[0][1] if self.highs else math.nan
+
+    def low(self):
+        return self.lows[0][1] if self.lows else math.nan
+
+    def vwap(self):
+        return self.pv / self.volume if self.volume > 0 else math.nan
+
+class Candles:
+    """OHLCV candles of one interval; only the last `keep` closed ones are kept"""
+
+    def __init__(self, seconds, keep=120):
+        self.interval_ms = int(seconds * 1000)
+        self.closed = deque(maxlen=keep)  # (open ms, open, high, low, close, volume)
+        self.current = None
+
+    def add(self, time_ms, price, volume=0.0):
+        start = time_ms - time_ms % self.interval_ms
+        current = self.current
+        if current is None or start > current[0]:
+            if current is not None:
+                self.closed.append(tuple(current))
+            self.current = [start, price, price, price, price, volume]
+            return
+        current[2] = max(current[2], price)
+        current[3] = min(current[3], price)
+        current[4] = price
+        current[5] += volume
+
+    def all(self):
+        """Closed candles followed by the one still forming"""
+        candles = list(self.closed)
+        if self.current is not None:
+            candles.append(tuple(self.current))
+        return candles
+
+class EMA:
+    """Exponential moving average over a time constant, for irregular ticks"""
+
+    def __init__(self, seconds):
+        self.tau_ms = seconds * 1000
+        self.value = math.nan
+        self.time_ms = None
+
+    def add(self, time_ms, price):
+        if self.time_ms is None:
+            self.value = price
+        else:
+            alpha = 1 - math.exp(-max(time_ms - self.time_ms, 0) / self.tau_ms)
+            self.value += alpha * (price - self.value)
+        self.time_ms = time_ms
+
+class SymbolStats:
+    """All rolling statistics of one symbol"""
+
+    def __init__(self, windows=WINDOWS, candles=CANDLES, emas=EMAS):
+        self.windows = {seconds: RollingWindow(seconds) for seconds in windows}
+        self.candles = {seconds: Candles(seconds, keep) for seconds, keep in candles}
+        self.emas = {seconds: EMA(seconds) for seconds in emas}
+        self.last_price = math.nan
+        self.last_time = 0
+
+    def add(self, time_ms, price, volume=0.0):
+        self.last_price = price
+        self.last_time = time_ms
+        for window in self.windows.values():
+            window.add(time_ms, price, volume)
+        for candles in self.candles.values():
+            candles.add(time_ms, price, volume)
+        for ema in self.emas.values():
+            ema.add(time_ms, price)
+
+    def summary(self, seconds=None):
+        """Short text for logs: range and VWAP of one window, EMAs"""
+        window = self.windows[seconds or min(self.windows)]
+        emas = " ".join(f"ema{s}s {ema.value:.4f}" for s, ema in self.emas.items())
+        return (f"{self.last_price:.4f} {window.span_ms // 1000}s "
+                f"[{window.low():.4f}-{window.high():.4f}] vwap {window.vwap():.4f} {emas}")
+
+class StatsEngine:
+    """SymbolStats per symbol, created on a symbol's first tick.
+
+    Set cumulative_volume when ticks carry a running total (the 24h
+    volume of @ticker) rather than per-trade quantities (@aggTrade);
+    the engine then feeds the windows the traded difference.
+    """
+
+    def __init__(self, cumulative_volume=False, windows=WINDOWS, candles=CANDLES, emas=EMAS):
+        self.cumulative_volume = cumulative_volume
+        self.config = (windows, candles, emas)
+        self.symbols = {}
+        self._totals = {}
+
+    def update(self, symbol, time_ms, price, volume=0.0):
+        stats = self.symbols.get(symbol)
+        if stats is None:
+            stats = self.symbols[symbol] = SymbolStats(*self.config)
+        if self.cumulative_volume:
+            last = self._totals.get(symbol)
+            self._totals[symbol] = volume
+            # The 24h total also shrinks as old trades leave it; count only growth
+            volume = volume - last if last is not None and volume > last else 0.0
+        stats.add(time_ms, price, volume)
+        return stats
+
+    def clear(self):
+        self.symbols = {}
+        self._totals = {}
+
+    def seed(self, symbol, times, prices, volumes):
+        """Load history (e.g. kline closes, oldest first) before live ticks"""
+        stats = self.symbols.get(symbol)
+        if stats is None:
+            stats = self.symbols[symbol] = SymbolStats(*self.config)
+        for time_ms, price, volume in zip(times.tolist(), prices.tolist(), volumes.tolist()):
+            stats.add(time_ms, price, volume)
+
+    def get(self, symbol):
+        return self.symbols.get(symbol)
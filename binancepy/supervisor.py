@@ -0,0 +1,289 @@
+import asyncio
+import json
+import random
+import time
+import websockets
+
+QUIET_AFTER = 10.0  # Seconds of socket silence before the primary counts as stalled
+FAILOVER_LAG = 1.0  # Seconds the standby may be ahead of the primary (about one @ticker interval)
+CHECK_INTERVAL = 0.25  # Seconds between staleness checks
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+def now_ms():
+    return int(time.time() * 1000)
+
+class StreamHealth:
+    """Freshness of every stream, judged by exchange event time.
+
+    The local clock and Binance's differ, so the offset between receive
+    time and event time is tracked as a slowly rising minimum; staleness
+    is how far the newest event lags behind "now" once that offset is
+    taken out. clock gives "now" in epoch ms (a replay passes its own).
+    """
+
+    def __init__(self, clock=now_ms):
+        self.clock = clock
+        self.last_event = {}
+        self.offset = None
+
+    def observe(self, stream, event_ms, received_ms=None):
+        if not event_ms:
+            return
+        lag = (received_ms or self.clock()) - event_ms
+        # Let the estimate creep up 1 ms per event so clock drift is followed
+        self.offset = lag if self.offset is None else min(self.offset + 1, lag)
+        if event_ms > self.last_event.get(stream, 0):
+            self.last_event[stream] = event_ms
+
+    def staleness(self, stream=None, at_ms=None):
+        """Seconds since one stream's newest event (or the freshest of all)"""
+        if stream is None:
+            newest = max(self.last_event.values(), default=None)
+        else:
+            newest = self.last_event.get(stream)
+        if newest is None:
+            return None
+        return ((at_ms or self.clock()) - self.offset - newest) / 1000
+
+    def forget(self, stream):
+        self.last_event.pop(stream, None)
+
+class StaleStreams:
+    """Streams whose own newest event lags by quiet_after or more.
+
+    Only a diagnostic: a quiet pair on a live socket is not a stall.
+    check() logs streams going stale and catching up again; finished
+    windows are kept as (stream, last event ms before, seconds).
+    """
+
+    def __init__(self, health, quiet_after=QUIET_AFTER):
+        self.health = health
+        self.quiet_after = quiet_after
+        self.since = {}  # Stale stream -> its last event before going quiet
+        self.windows = []
+
+    def check(self, at_ms=None):
+        at_ms = at_ms or self.health.clock()
+        for stream in set(self.since) - set(self.health.last_event):
+            del self.since[stream]  # Unsubscribed
+        for stream, newest in self.health.last_event.items():
+            staleness = self.health.staleness(stream, at_ms)
+            if staleness >= self.quiet_after:
+                if stream not in self.since:
+                    self.since[stream] = newest
+                    print(f"Watchdog: no new {stream} events for {staleness:.0f}s")
+            elif stream in self.since:
+                started = self.since.pop(stream)
+                seconds = (newest - started) / 1000
+                self.windows.append((stream, started, seconds))
+                print(f"Watchdog: {stream} events are current again after {seconds:.1f}s")
+
+class Backoff:
+    """Exponential reconnect delays with jitter, so restarts don't stampede"""
+
+    def __init__(self, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+        self.base = base
+        self.cap = cap
+        self.attempts = 0
+
+    def next(self):
+        delay = min(self.cap, self.base * 2 ** self.attempts)
+        self.attempts += 1
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def reset(self):
+        self.attempts = 0
+
+class GapMeter:
+    """Outage windows as the display sees them.
+
+    An outage starts at the last frame delivered before a failure was
+    noticed and ends at the first frame delivered after it, so detection
+    time, backoff and handshake are all included.
+    """
+
+    def __init__(self):
+        self.gaps = []  # (seconds, cause)
+        self.last_delivered = time.monotonic()
+        self.outage = None  # (started, cause)
+
+    def failure(self, cause):
+        if self.outage is None:
+            self.outage = (self.last_delivered, cause)
+
+    def delivered(self):
+        now = time.monotonic()
+        self.last_delivered = now
+        if self.outage is not None:
+            started, cause = self.outage
+            self.outage = None
+            self.gaps.append((now - started, cause))
+            print(f"Supervisor: recovered from {cause} after a {now - started:.2f}s gap")
+
+    def summary(self):
+        if not self.gaps:
+            return "no outages"
+        seconds = sorted(gap for gap, _ in self.gaps)
+        return (f"{len(seconds)} outages, median gap {seconds[len(seconds) // 2]:.2f}s, "
+                f"max {seconds[-1]:.2f}s, last {self.gaps[-1][0]:.2f}s ({self.gaps[-1][1]})")
+
+class Slot:
+    """One of the supervisor's WebSocket connections"""
+
+    def __init__(self, name):
+        self.name = name
+        self.ws = None
+        self.primary = False
+        self.since = 0.0  # When it last became primary
+        self.last_received = 0.0
+        self.backoff = Backoff()
+
+class Supervisor:
+    """Keeps the stream connected, failing over to a warm standby.
+
+    url() gives the stream URL at connect time and on_message(frame)
+    receives every frame of the primary connection. With standby=True a
+    second connection to the same streams is kept open and read, but
+    its frames are dropped; when the primary errors out or its socket
+    goes quiet the standby is promoted at once
+    and the old primary reconnects, with jittered exponential backoff,
+    to become the new standby.
+    """
+
+    def __init__(self, url, on_message, health, standby=False, quiet_after=QUIET_AFTER,
+                 on_status=None):
+        self.url = url
+        self.on_message = on_message
+        self.health = health
+        self.quiet_after = quiet_after
+        self.on_status = on_status or (lambda text: None)
+        self.slots = [Slot("A")] + ([Slot("B")] if standby else [])
+        self.gaps = GapMeter()
+        self.failovers = 0
+        self.reconnects = 0
+        self.stale = StaleStreams(health, quiet_after)
+
+    @property
+    def primary(self):
+        return next((slot for slot in self.slots if slot.primary), None)
+
+    def _standby(self):
+        """A connected, recently heard-from non-primary slot, or None"""
+        now = time.monotonic()
+        for slot in self.slots:
+            if not slot.primary and slot.ws is not None and now - slot.last_received < self.quiet_after:
+                return slot
+        return None
+
+    def _promote(self, cause):
+        """Make a live standby the primary; True if there was one"""
+        standby = self._standby()
+        if standby is None:
+            return False
+        old = self.primary
+        if old is not None:
+            old.primary = False
+        standby.primary = True
+        standby.since = time.monotonic()
+        self.failovers += 1
+        print(f"Supervisor: {cause} on {old.name if old else '-'}, standby {standby.name} took over")
+        return True
+
+    async def _connection(self, slot):
+        """Connect, read and reconnect one slot forever"""
+        while True:
+            try:
+                async with websockets.connect(self.url(), ping_interval=30, ping_timeout=10) as ws:
+                    slot.ws = ws
+                    slot.last_received = time.monotonic()
+                    if self.primary is None:
+                        slot.primary = True
+                        slot.since = time.monotonic()
+                        self.on_status("Connected")
+                    print(f"WebSocket {slot.name} connected{' (primary)' if slot.primary else ' (standby)'}")
+                    while True:
+                        message = await ws.recv(decode=False)
+                        slot.last_received = time.monotonic()
+                        slot.backoff.reset()
+                        if slot.primary:
+                            self.on_message(message)
+                            self.gaps.delivered()
+            except websockets.ConnectionClosedOK:
+                print(f"WebSocket {slot.name} closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"WebSocket {slot.name} error: {e}")
+            finally:
+                slot.ws = None
+
+            if slot.primary:
+                slot.primary = False
+                self.gaps.failure("disconnect")
+                if not self._promote("disconnect"):
+                    self.on_status("Reconnecting...")
+            self.reconnects += 1
+            delay = slot.backoff.next()
+            print(f"WebSocket {slot.name}: reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _watch(self):
+        """Fail over (or reconnect) when the primary's socket goes quiet"""
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            primary = self.primary
+            if primary is None or primary.ws is None:
+                continue
+            # Event times are judged once the socket has had time to deliver new ones
+            now = time.monotonic()
+            if now - primary.since >= self.quiet_after:
+                self.stale.check()
+            # Stalled only if the socket itself is silent. Both sockets carry
+            # the same frames, so once the standby has had frames for about
+            # a stream interval that the primary hasn't, the primary is stuck
+            silent = now - primary.last_received
+            standby = self._standby()
+            behind = standby is not None and standby.last_received - primary.last_received > FAILOVER_LAG
+            if not behind and silent < self.quiet_after:
+                continue
+
+            self.gaps.failure("stall")
+            if not self._promote("stall"):
+                print("Watchdog: Connection seems dead, reconnecting...")
+                self.on_status("Reconnecting...")
+            # The stalled socket is dropped either way and comes back as
+            # standby. No close handshake: on a half-open link it would
+            # hold the watchdog for the whole close timeout
+            primary.ws.transport.abort()
+
+    async def _send_commands(self, commands, stream_name):
+        """Send queued SUBSCRIBE/UNSUBSCRIBE requests to every open connection"""
+        request_id = 0
+        while True:
+            method, pairs = await commands.get()
+            request_id += 1
+            request = json.dumps({
+                "method": method,
+                "params": [stream_name(pair) for pair in pairs],
+                "id": request_id,
+            })
+            for slot in self.slots:
+                if slot.ws is not None:
+                    try:
+                        await slot.ws.send(request)
+                    except websockets.ConnectionClosed:
+                        pass
+            print(f"{method} {', '.join(pairs)}")
+
+    async def run(self, commands, stream_name):
+        tasks = [asyncio.create_task(self._connection(slot)) for slot in self.slots]
+        tasks.append(asyncio.create_task(self._watch()))
+        tasks.append(asyncio.create_task(self._send_commands(commands, stream_name)))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            print(f"Supervisor: {self.reconnects} reconnects, {self.failovers} failovers, {self.gaps.summary()}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
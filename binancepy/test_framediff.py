@@ -0,0 +1,110 @@
+import random
+from luma.oled.device import ssd1306
+from PIL import Image, ImageDraw
+from fakeserial import CountingSerial
+from framediff import COLUMNADDR, PAGEADDR, DiffingDevice, frame_pages
+
+WIDTH, HEIGHT = 128, 32
+
+class RecordingSerial(CountingSerial):
+    """CountingSerial that also keeps commands and data in bus order"""
+
+    def reset(self):
+        super().reset()
+        self.writes = []
+
+    def command(self, *cmd):
+        super().command(*cmd)
+        self.writes.append(("command", cmd))
+
+    def data(self, data):
+        super().data(data)
+        self.writes.append(("data", list(data)))
+
+class ControllerRAM:
+    """SSD1306 display RAM in horizontal addressing mode, fed from bus writes"""
+
+    def __init__(self, width=WIDTH, pages=HEIGHT // 8):
+        self.pages = [bytearray(width) for _ in range(pages)]
+        self.columns = (0, width - 1)
+        self.page_range = (0, pages - 1)
+        self.column = self.page = 0
+
+    def replay(self, writes):
+        for kind, payload in writes:
+            if kind == "command":
+                self._command(payload)
+            else:
+                self._data(payload)
+
+    def _command(self, cmd):
+        i = 0
+        while i < len(cmd):
+            if cmd[i] == COLUMNADDR:
+                self.columns = (cmd[i + 1], cmd[i + 2])
+                self.column = cmd[i + 1]
+                i += 3
+            elif cmd[i] == PAGEADDR:
+                self.page_range = (cmd[i + 1], cmd[i + 2])
+                self.page = cmd[i + 1]
+                i += 3
+            else:
+                i += 1
+
+    def _data(self, data):
+        for byte in data:
+            self.pages[self.page][self.column] = byte
+            if self.column == self.columns[1]:
+                self.column = self.columns[0]
+                self.page = self.page + 1 if self.page < self.page_range[1] else self.page_range[0]
+            else:
+                self.column += 1
+
+def random_frame(rng):
+    image = Image.new("1", (WIDTH, HEIGHT))
+    draw = ImageDraw.Draw(image)
+    for _ in range(rng.randrange(4)):
+        x, y = rng.randrange(WIDTH), rng.randrange(HEIGHT)
+        draw.rectangle((x, y, x + rng.randrange(40), y + rng.randrange(12)), fill=rng.randrange(2))
+    if rng.random() < 0.7:
+        draw.text((rng.randrange(60), rng.randrange(20)), f"${rng.uniform(0, 10):.4f}", fill=1)
+    return image
+
+def test_diffed_writes_rebuild_the_full_frame_ram():
+    rng = random.Random(4)
+    full_serial, diff_serial = RecordingSerial(), RecordingSerial()
+    full = ssd1306(full_serial, width=WIDTH, height=HEIGHT)
+    diffing = DiffingDevice(ssd1306(diff_serial, width=WIDTH, height=HEIGHT))
+    full_ram, diff_ram = ControllerRAM(), ControllerRAM()
+    full_serial.reset()
+    diff_serial.reset()
+
+    image = random_frame(rng)
+    for _ in range(300):
+        # Mostly small edits to the previous frame, sometimes a new one
+        if rng.random() < 0.2:
+            image = random_frame(rng)
+        else:
+            image = image.copy()
+            for _ in range(rng.randrange(1, 4)):
+                image.putpixel((rng.randrange(WIDTH), rng.randrange(HEIGHT)), rng.randrange(2))
+        full.display(image)
+        diffing.display(image)
+        full_ram.replay(full_serial.writes)
+        diff_ram.replay(diff_serial.writes)
+        full_serial.writes.clear()
+        diff_serial.writes.clear()
+
+        assert diff_ram.pages == full_ram.pages
+        assert [bytes(page) for page in diff_ram.pages] == frame_pages(image, HEIGHT // 8)
+
+    assert diff_serial.bytes_sent < full_serial.bytes_sent
+
+def test_unchanged_frame_sends_nothing():
+    serial = RecordingSerial()
+    device = DiffingDevice(ssd1306(serial, width=WIDTH, height=HEIGHT))
+    image = random_frame(random.Random(1))
+    device.display(image)
+    serial.reset()
+    device.display(image.copy())
+    assert serial.bytes_sent == 0
@@ -0,0 +1,42 @@
+import json
+import random
+import pytest
+from parsers import parse_ticker_fast, parse_ticker_json
+
+def ticker(rng, symbol):
+    """A 24hrTicker payload laid out like Binance's"""
+    price = rng.uniform(1e-6, 1e5)
+    return {
+        "e": "24hrTicker", "E": rng.randrange(10 ** 12, 2 * 10 ** 12), "s": symbol,
+        "p": f"{rng.uniform(-1, 1):.4f}", "P": f"{rng.uniform(-50, 50):.3f}", "w": f"{price:.7f}",
+        "c": f"{price:.8f}", "Q": f"{rng.uniform(0, 1e4):.2f}", "o": f"{price:.8f}",
+        "h": f"{price * 1.1:.8f}", "l": f"{price * 0.9:.8f}", "v": f"{rng.uniform(0, 1e9):.3f}",
+        "q": f"{rng.uniform(0, 1e9):.2f}", "O": 1, "C": 2, "F": 3, "L": 4, "n": rng.randrange(10 ** 6),
+    }
+
+def compact(data):
+    return json.dumps(data, separators=(",", ":"))
+
+def frames(rng):
+    symbols = ["FARTCOINUSDT", "BTCUSDT", "1000PEPEUSDT"]
+    for _ in range(200):
+        data = ticker(rng, rng.choice(symbols))
+        yield compact(data)
+        yield compact({"stream": f"{data['s'].lower()}@ticker", "data": data})
+        yield json.dumps({"stream": f"{data['s'].lower()}@ticker", "data": data}, indent=2)
+    arr = [ticker(rng, symbol) for symbol in symbols]
+    yield compact(arr)
+    yield compact({"stream": "!ticker@arr", "data": arr})
+    yield compact({"result": None, "id": 1})
+    yield compact({"result": ["fartcoinusdt@ticker"], "id": 12})
+
+@pytest.mark.parametrize("kind", [str, bytes])
+def test_fast_parser_matches_json_parser(kind):
+    for frame in frames(random.Random(12)):
+        message = frame if kind is str else frame.encode()
+        assert parse_ticker_fast(message) == parse_ticker_json(message), frame
+
+def test_replies_are_not_ticks():
+    for message in ('{"result":null,"id":1}', b'{"result":null,"id":1}'):
+        assert parse_ticker_fast(message) is None
+        assert parse_ticker_json(message) is None
@@ -0,0 +1,32 @@
+import random
+from screener import IndexedHeap
+
+def test_top_matches_sorted_through_updates_and_removals():
+    rng = random.Random(15)
+    heap = IndexedHeap()
+    values = {}
+    for step in range(5000):
+        key = f"S{rng.randrange(200)}"
+        if key in values and rng.random() < 0.1:
+            heap.remove(key)
+            del values[key]
+        else:
+            # Coarse values, so ties are common
+            values[key] = rng.randrange(-50, 50) / 2
+            heap.update(key, values[key])
+
+        if step % 50 == 0:
+            k = rng.randrange(1, 12)
+            expected = sorted(values.values(), reverse=True)[:k]
+            top = heap.top(k)
+            assert [value for _, value in top] == expected
+            assert all(values[key] == value for key, value in top)
+            assert len(heap) == len(values)
+            assert all(heap.keys[heap.position[key]] == key for key in values)
+
+def test_top_of_empty_and_short_heaps():
+    heap = IndexedHeap()
+    assert heap.top(3) == []
+    heap.update("A", 1.0)
+    heap.remove("missing")
+    assert heap.top(3) == [("A", 1.0)]
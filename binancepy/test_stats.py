@@ -0,0 +1,40 @@
+import math
+import random
+import pytest
+from stats import RollingWindow
+
+def brute_force(ticks, window, now_ms):
+    """High, low and VWAP of the ticks whose bucket is still inside the window"""
+    kept = [(price, volume) for time_ms, price, volume in ticks
+            if time_ms - time_ms % window.bucket_ms + window.bucket_ms > now_ms - window.span_ms]
+    if not kept:
+        return math.nan, math.nan, math.nan
+    volume = sum(volume for _, volume in kept)
+    vwap = sum(price * volume for price, volume in kept) / volume if volume > 0 else math.nan
+    return max(price for price, _ in kept), min(price for price, _ in kept), vwap
+
+@pytest.mark.parametrize("seconds, buckets", [(60, 120), (300, 120), (10, 7)])
+def test_high_low_vwap_match_brute_force(seconds, buckets):
+    rng = random.Random(seconds)
+    window = RollingWindow(seconds, buckets)
+    ticks = []
+    time_ms = 1_700_000_000_000
+    price = 1.0
+    for step in range(4000):
+        # Bursts, normal spacing and the odd gap longer than the window
+        time_ms += rng.choice((0, rng.randrange(1, 2000), rng.randrange(1, 400) * 1000 if step % 500 == 0 else 50))
+        price *= math.exp(rng.gauss(0, 0.002))
+        volume = rng.choice((0.0, rng.uniform(0, 100)))
+        window.add(time_ms, price, volume)
+        ticks.append((time_ms, price, volume))
+        # Older ticks can't be in the window any more
+        while ticks[0][0] < time_ms - window.span_ms - window.bucket_ms:
+            ticks.pop(0)
+
+        high, low, vwap = brute_force(ticks, window, time_ms)
+        assert window.high() == high
+        assert window.low() == low
+        if math.isnan(vwap):
+            assert math.isnan(window.vwap())
+        else:
+            assert window.vwap() == pytest.approx(vwap, rel=1e-9)
@@ -0,0 +1,257 @@
+"""CoinMarketCap quotes for every tracked symbol in one request.
+
+Responses are cached (in memory and on disk) and only refreshed once
+they are older than the refresh interval, which is planned from the
+credits CMC reports spending (the `status.credit_count` of each
+response) so the day's budget lasts until the UTC reset. Both variants
+the trackers use sit behind the same interface:
+
+  quotes  /v2/cryptocurrency/quotes/latest, keyed by symbol (FARTCOIN)
+  dex     /v4/dex/pairs/quotes/latest, keyed by pair contract address
+
+Usage: python cmc_client.py KEY [KEY ...] [--variant quotes|dex] [--network solana] [--budget 333]
+(the API key is read from CMC_PRO_API_KEY)
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from requests import Session
+from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
+
+# Shared file helpers live next to the trackers in binancepy/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "binancepy"))
+from atomicfile import atomic_write_json
+
+BASE_URL = os.environ.get("CMC_API_URL", "https://pro-api.coinmarketcap.com")
+CACHE_PATH = os.path.expanduser("~/.cache/price_tracker/cmc.json")
+DAILY_CREDITS = 333  # Basic plan: 10,000 credits a month
+CACHE_TTL = 60  # Seconds a quote is served from cache at the least
+CONVERT = "USD"
+
+# path, parameter the keys go in, keys per credit
+Variant = namedtuple("Variant", "path key_param keys_per_credit")
+VARIANTS = {
+    "quotes": Variant("/v2/cryptocurrency/quotes/latest", "symbol", 100),
+    "dex": Variant("/v4/dex/pairs/quotes/latest", "contract_address", 100),
+}
+
+# price, last_updated (epoch ms), fetched_at (epoch s)
+Quote = namedtuple("Quote", "price updated fetched_at")
+
+def parse_time(text):
+    """Epoch ms of a CMC ISO timestamp, or None"""
+    try:
+        return int(datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp() * 1000)
+    except (AttributeError, ValueError):
+        return None
+
+def parse_quotes(payload, fetched_at, convert=CONVERT):
+    """{key: Quote} from a v2 quotes or v4 DEX pairs response"""
+    quotes = {}
+    data = payload.get("data") or {}
+    if isinstance(data, dict):
+        # v2: {"FARTCOIN": [coin, ...]}; the first coin is CMC's best match
+        entries = [(key, coins[0] if isinstance(coins, list) else coins) for key, coins in data.items() if coins]
+    else:
+        # v4: [{"contract_address": ..., "quote": [{...}]}, ...]
+        entries = [(entry.get("contract_address"), entry) for entry in data]
+    for key, entry in entries:
+        quote = entry.get("quote")
+        if isinstance(quote, list):
+            quote = quote[0] if quote else None
+        elif isinstance(quote, dict):
+            quote = quote.get(convert)
+        if not quote or quote.get("price") is None:
+            continue
+        updated = parse_time(quote.get("last_updated") or entry.get("last_updated"))
+        quotes[key] = Quote(float(quote["price"]), updated or int(fetched_at * 1000), fetched_at)
+    return quotes
+
+def utc_day(now=None):
+    return datetime.fromtimestamp(now or time.time(), timezone.utc).strftime("%Y-%m-%d")
+
+def seconds_to_reset(now=None):
+    """Seconds until the next UTC midnight, when CMC's daily count starts over"""
+    now = now or time.time()
+    return 86400 - now % 86400
+
+class CMCClient:
+    """Batched, cached CMC quotes within a daily credit budget.
+
+    Every key passed to quotes() is tracked from then on, and a refresh
+    always asks for all tracked keys in one request. The credits spent
+    today and the last quotes are kept in cache_path, so restarting a
+    tracker neither forgets the spend nor pays for a fresh fetch.
+    """
+
+    def __init__(self, api_key, variant="quotes", daily_credits=DAILY_CREDITS, ttl=CACHE_TTL,
+                 network=None, convert=CONVERT, cache_path=CACHE_PATH, session=None):
+        self.variant = VARIANTS[variant]
+        self.name = variant
+        self.daily_credits = daily_credits
+        self.ttl = ttl
+        self.network = network  # network_slug of the DEX pairs, e.g. "solana"
+        self.convert = convert
+        self.cache_path = cache_path
+        self.session = session or Session()
+        self.session.headers.update({"Accepts": "application/json", "X-CMC_PRO_API_KEY": api_key})
+        self.tracked = []
+        self.cache = {}
+        self.unknown = set()  # Keys the last refresh returned nothing for
+        self.refreshed_at = 0.0  # When the last refresh succeeded
+        self.day = utc_day()
+        self.spent = 0
+        self.unsaved = 0  # Credits spent since the ledger was last written
+        self.retry_at = 0.0  # After a failed refresh, when to try again
+        self.requests = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path) as f:
+                saved = json.load(f)
+            if saved["day"] == utc_day():
+                self.spent = saved["spent"]
+            self.cache = {key: Quote(*quote) for key, quote in saved["quotes"].get(self.name, {}).items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save(self):
+        """Write spend and quotes atomically.
+
+        Trackers sharing an API key share its credits, so the spend is
+        added to what the file already holds and other variants' quotes
+        are kept.
+        """
+        try:
+            with open(self.cache_path) as f:
+                saved = json.load(f)
+            quotes = saved["quotes"]
+            spent = saved["spent"] if saved["day"] == self.day else 0
+        except (OSError, ValueError, KeyError, TypeError):
+            quotes, spent = {}, self.spent - self.unsaved
+        self.spent, self.unsaved = spent + self.unsaved, 0
+        quotes[self.name] = {key: list(quote) for key, quote in self.cache.items()}
+        try:
+            atomic_write_json(self.cache_path, {"day": self.day, "spent": self.spent, "quotes": quotes})
+        except OSError as e:
+            print(f"CMC cache error: {e}")
+
+    def track(self, keys):
+        for key in keys:
+            if key not in self.tracked:
+                self.tracked.append(key)
+
+    def refresh_cost(self):
+        """Credits one refresh of every tracked key costs"""
+        return max(1, math.ceil(len(self.tracked) / self.variant.keys_per_credit))
+
+    def credits_left(self):
+        if utc_day() != self.day:
+            self.day, self.spent, self.unsaved = utc_day(), 0, 0
+        return self.daily_credits - self.spent
+
+    def refresh_interval(self):
+        """Seconds between refreshes that spread what is left of the budget over the day"""
+        refreshes = self.credits_left() // self.refresh_cost()
+        if refreshes <= 0:
+            return seconds_to_reset()
+        return max(self.ttl, seconds_to_reset() / refreshes)
+
+    def age(self, keys=None):
+        """Seconds since the oldest of the keys (default: tracked) was fetched; inf if one is missing.
+
+        Keys CMC had no quote for count as fetched at the last refresh, so
+        they wait for the next planned one instead of forcing a new request.
+        """
+        keys = keys if keys is not None else self.tracked
+        fetched = []
+        for key in keys:
+            if key in self.unknown:
+                fetched.append(self.refreshed_at)
+            elif key in self.cache:
+                fetched.append(self.cache[key].fetched_at)
+            else:
+                return math.inf
+        if not fetched:
+            return math.inf
+        return time.time() - min(fetched)
+
+    def next_refresh_in(self):
+        return max(self.refresh_interval() - self.age(), 0.0)
+
+    def refresh(self):
+        """Fetch every tracked key in one request; returns the new quotes"""
+        if not self.tracked:
+            return {}
+        if self.credits_left() < self.refresh_cost():
+            print(f"CMC: daily budget of {self.daily_credits} credits used, serving cached quotes")
+            self.retry_at = time.time() + self.ttl
+            return {}
+        params = {self.variant.key_param: ",".join(self.tracked), "convert": self.convert}
+        if self.network and self.name == "dex":
+            params["network_slug"] = self.network
+        try:
+            response = self.session.get(BASE_URL + self.variant.path, params=params, timeout=15)
+            payload = response.json()
+        except (ConnectionError, Timeout, TooManyRedirects, ValueError) as e:
+            print(f"CMC error: {e}")
+            self.retry_at = time.time() + self.ttl
+            return {}
+        self.requests += 1
+
+        status = payload.get("status") or {}
+        # Failed calls can cost credits too, so count what CMC says either way
+        self.credits_left()
+        credits = status.get("credit_count", self.refresh_cost() if response.ok else 0)
+        self.spent += credits
+        self.unsaved += credits
+        if not response.ok or status.get("error_code"):
+            print(f"CMC error {status.get('error_code', response.status_code)}: {status.get('error_message')}")
+            self.retry_at = time.time() + self.ttl
+            self._save()
+            return {}
+
+        self.refreshed_at = time.time()
+        quotes = parse_quotes(payload, self.refreshed_at, self.convert)
+        self.cache.update(quotes)
+        unknown = set(self.tracked) - set(quotes)
+        if unknown - self.unknown:
+            print(f"CMC: no quote for {', '.join(sorted(unknown - self.unknown))}")
+        self.unknown = unknown
+        self._save()
+        return quotes
+
+    def quotes(self, keys):
+        """{key: Quote} for the keys, from cache unless it is due for a refresh"""
+        self.track(keys)
+        if self.age(keys) >= self.refresh_interval() and time.time() >= self.retry_at:
+            self.refresh()
+        return {key: self.cache[key] for key in keys if key in self.cache}
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched, budgeted CoinMarketCap quotes")
+    parser.add_argument("keys", nargs="+", help="symbols (quotes) or pair contract addresses (dex)")
+    parser.add_argument("--variant", default="quotes", choices=sorted(VARIANTS))
+    parser.add_argument("--network", help="network_slug for --variant dex, e.g. solana")
+    parser.add_argument("--budget", type=int, default=DAILY_CREDITS, help="credits per UTC day")
+    args = parser.parse_args()
+
+    client = CMCClient(os.environ.get("CMC_PRO_API_KEY", ""), args.variant, args.budget, network=args.network)
+    try:
+        while True:
+            for key, quote in client.quotes(args.keys).items():
+                print(f"[{time.strftime('%H:%M:%S')}] {key}: ${quote.price:,.6g} ({time.time() - quote.fetched_at:.0f}s old)")
+            wait = client.next_refresh_in()
+            print(f"  {client.spent}/{client.daily_credits} credits today, next refresh in {wait:.0f}s")
+            time.sleep(max(wait, 1))
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+if __name__ == "__main__":
+    main()
@@ -1,134 +1,118 @@
-import requests
+import os
+import sys
 import time
 from datetime import datetime
 
+# Shared Binance helpers live next to the trackers in binancepy/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "binancepy"))
+from catalog import SymbolCatalog, normalize
+import exchange_cache
+from poller import PricePoller
+from scheduler import PollScheduler
+
 # Function to get all available symbols from Binance
 def get_available_symbols():
-    # For spot trading pairs
-    spot_url = "https://api.binance.com/api/v3/exchangeInfo"
-    # For futures trading pairs
-    futures_url = "https://fapi.binance.com/fapi/v1/exchangeInfo"
-    
-    spot_symbols = []
-    futures_symbols = []
-    
-    try:
-        # Get spot trading pairs
-        spot_response = requests.get(spot_url)
-        spot_data = spot_response.json()
-        spot_symbols = [symbol['symbol'] for symbol in spot_data['symbols']]
-        print(f"Found {len(spot_symbols)} spot trading pairs")
-        
-        # Get futures trading pairs
-        futures_response = requests.get(futures_url)
-        futures_data = futures_response.json()
-        futures_symbols = [symbol['symbol'] for symbol in futures_data['symbols']]
-        print(f"Found {len(futures_symbols)} futures trading pairs")
-        
-        return {
-            "spot": spot_symbols,
-            "futures": futures_symbols
-        }
-    except Exception as e:
-        print(f"Error fetching symbols: {e}")
-        return {"spot": [], "futures": []}
+    # Served from the on-disk cache when present (refreshed in the
+    # background once stale); otherwise spot and futures are fetched in parallel
+    markets = exchange_cache.get_markets()
+    print(f"Found {len(markets['spot'])} spot trading pairs")
+    print(f"Found {len(markets['futures'])} futures trading pairs")
+    return markets
 
 # Function to find closest match to user's input
-def find_closest_match(user_input, available_symbols):
-    # Convert to uppercase for consistency
-    user_input = user_input.upper()
-    
-    # Exact match
-    if user_input in available_symbols["spot"]:
-        return ("spot", user_input)
-    if user_input in available_symbols["futures"]:
-        return ("futures", user_input)
-    
-    # Partial match (symbol contains the user input)
-    spot_matches = [s for s in available_symbols["spot"] if user_input in s]
-    futures_matches = [s for s in available_symbols["futures"] if user_input in s]
-    
-    # Return first match if any found
-    if spot_matches:
-        return ("spot", spot_matches[0])
-    if futures_matches:
-        return ("futures", futures_matches[0])
+def find_closest_match(user_input, catalog):
+    # Best ranked hit: exact symbol, then base asset (BTC -> BTCUSDT),
+    # then prefix and fuzzy matches
+    matches = catalog.search(user_input, limit=1)
+    if matches:
+        return matches[0]
     
     # No match found
     return (None, None)
 
-# Function to fetch price for a symbol
-def fetch_price(market_type, symbol, interval_seconds):
-    if market_type == "spot":
-        url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
-    elif market_type == "futures":
-        url = f"https://fapi.binance.com/fapi/v1/ticker/price?symbol={symbol}"
-    else:
+# Function to fetch prices for one or more symbols of a market
+def fetch_price(market_type, symbols, interval_seconds):
+    if market_type not in ("spot", "futures"):
         print("Invalid market type")
         return
+    if isinstance(symbols, str):
+        symbols = [symbols]
     
-    print(f"Starting price fetch for {symbol} ({market_type}) every {interval_seconds} seconds...")
+    # One keep-alive session; many symbols share a single all-symbols request
+    poller = PricePoller(market_type)
+    # Volatile symbols are polled faster and flat ones slower, spending no
+    # more request weight than polling everything every interval_seconds
+    scheduler = PollScheduler(poller, symbols, max(1, interval_seconds / 10), interval_seconds * 4,
+                              weight_rate=poller.weight(len(symbols)) / interval_seconds)
+    print(f"Starting price fetch for {', '.join(symbols)} ({market_type}) about every {interval_seconds} seconds...")
     
     try:
         while True:
-            try:
-                response = requests.get(url)
-                data = response.json()
-                
-                # Format the timestamp
-                now = datetime.now()
-                timestamp = now.strftime("%H:%M:%S")
-                
+            prices = scheduler.poll()
+            
+            # Format the timestamp
+            now = datetime.now()
+            timestamp = now.strftime("%H:%M:%S")
+            
+            for symbol in symbols:
+                if symbol not in prices:
+                    continue
                 # Format the price
-                price_float = float(data['price'])
+                price_float = prices[symbol][0]
                 formatted_price = f"${price_float:,.8f}" if price_float < 0.1 else f"${price_float:,.2f}"
                 
-                print(f"[{timestamp}] {data['symbol']}: {formatted_price}")
-                
-            except Exception as e:
-                print(f"Error fetching price: {e}")
-                print(f"Response: {response.text if 'response' in locals() else 'No response'}")
+                print(f"[{timestamp}] {symbol}: {formatted_price}")
             
-            time.sleep(interval_seconds)
+            time.sleep(scheduler.wait())
             
     except KeyboardInterrupt:
         print("\nPrice fetching stopped")
+    finally:
+        poller.close()
 
 # Main function
 def main():
     # Get available symbols first
-    print("Fetching available trading pairs from Binance...")
+    print("Loading available trading pairs...")
     available_symbols = get_available_symbols()
+    catalog = SymbolCatalog(available_symbols)
     
     # Ask user for input
     user_symbol = input("Enter the cryptocurrency symbol to track (e.g., BTCUSDT, ETHUSDT): ")
     
-    # Find matching symbol
-    market_type, matched_symbol = find_closest_match(user_symbol, available_symbols)
+    # Type-ahead: keep refining until the input names a symbol
+    while True:
+        market_type, matched_symbol = find_closest_match(user_symbol, catalog)
+        if matched_symbol is None or matched_symbol == normalize(user_symbol):
+            break
+        
+        suggestions = catalog.search(user_symbol, limit=5)
+        print(f"Closest matches for '{user_symbol}':")
+        for number, (market, s) in enumerate(suggestions, 1):
+            print(f"  {number}. {s} ({market})")
+        choice = input("Pick a number, type more to refine, or press Enter for 1: ").strip()
+        
+        if not choice:
+            break
+        if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+            market_type, matched_symbol = suggestions[int(choice) - 1]
+            break
+        user_symbol = choice
     
     if matched_symbol:
         print(f"Found matching symbol: {matched_symbol} on {market_type} market")
+        symbols = [matched_symbol]
+        extra = input(f"More {market_type} symbols to track alongside it (comma-separated, optional): ")
+        for text in filter(None, (part.strip() for part in extra.split(","))):
+            hits = [s for market, s in catalog.search(text, limit=10) if market == market_type]
+            if hits and hits[0] not in symbols:
+                symbols.append(hits[0])
+            elif not hits:
+                print(f"No {market_type} symbol found for '{text}', skipping")
         interval = int(input("Enter update interval in seconds (default: 30): ") or "30")
-        fetch_price(market_type, matched_symbol, interval)
+        fetch_price(market_type, symbols, interval)
     else:
         print(f"No matching symbol found for '{user_symbol}'")
-        print("Available options containing similar names:")
-        
-        # Show some suggestions
-        user_base = ''.join([c for c in user_symbol.upper() if c.isalpha()])
-        if len(user_base) >= 3:
-            spot_suggestions = [s for s in available_symbols["spot"] if user_base in s][:5]
-            futures_suggestions = [s for s in available_symbols["futures"] if user_base in s][:5]
-            
-            if spot_suggestions:
-                print("Spot market suggestions:")
-                for s in spot_suggestions:
-                    print(f"  - {s}")
-            
-            if futures_suggestions:
-                print("Futures market suggestions:")
-                for s in futures_suggestions:
-                    print(f"  - {s}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file